@@ -9,17 +9,21 @@ Settings for the game can be changed in the settings.json file.
 import curses
 from curses import textpad
 
+import sys
 import time
 import string
-from random import *
 from enum import Enum
-from array import *
-import json
 import math
+import os
 
 # TODO These might need to be changed before the final build
+# the modules only some games need (solver, odds, no-guess pool, infinite world, saves, replays) are imported where they are used,
+# so the menu comes up without loading them
 from bin import ConsoleSweeperBones
 from bin import CursesUtils
+from bin import ConsoleSweeperScores
+from bin import ConsoleSweeperSettings
+from bin import ConsoleSweeperSession
 
 class GLOBAL_STATES(Enum):
 	MAIN_MENU = 0
@@ -30,37 +34,59 @@ class GLOBAL_STATES(Enum):
 
 APP_GLOBAL_STATE = GLOBAL_STATES.MAIN_MENU
 
-# load settings from JSON
-try:
-	APP_GLOBAL_SETTINGS_JSON = json.load(open("./bin/settings.json"))
-except:
-	#emergency default values
-	APP_GLOBAL_SETTINGS_JSON = { 
-		"grid_rows": 12,
-		"grid_cols": 12,
-		"difficulty": "NORMAL",
-		"colours": True,
-		"time_trial": False,
-		"time_limit": 100 
-	}
-
-SCENE_TRANSITION_DELAY = 2 
-
-# information about the minesweeper board
-MS_BOARD_SIZE_ROWS = APP_GLOBAL_SETTINGS_JSON['grid_rows']
-MS_BOARD_SIZE_COLS = APP_GLOBAL_SETTINGS_JSON['grid_cols']
-MS_USING_COLOURS = APP_GLOBAL_SETTINGS_JSON['colours']
-MS_BOARD_DIFFICULTY = ""
-try:
-	APP_GLOBAL_SETTINGS_JSON['difficulty'] = APP_GLOBAL_SETTINGS_JSON['difficulty'].upper()
-	MS_BOARD_DIFFICULTY = ConsoleSweeperBones.CSDifficulty[APP_GLOBAL_SETTINGS_JSON['difficulty'].upper()].value
-except:
-	MS_BOARD_DIFFICULTY = ConsoleSweeperBones.CSDifficulty["NORMAL"].value
+# information about the minesweeper board, filled in from the settings by load_app_settings when the app starts
+APP_GLOBAL_SETTINGS_JSON = None
+MS_BOARD_SIZE_ROWS = 0
+MS_BOARD_SIZE_COLS = 0
+MS_USING_COLOURS = True
+MS_BOARD_ENGINE = "tiles"
+MS_RECORD_REPLAYS = False
+MS_REPLAY_DIR = "./replays"
+MS_BOARD_MODE = "random"
+MS_BOARD_POOL_DIR = "./boardpool"
+MS_SAVE_FILE = "./savegame.sav"
+MS_SCORE_DB = "./scores.db"
+MS_FRAME_RATE = 60
+MS_TIME_TRIAL = False
+MS_TIME_LIMIT = 100
+MS_BOARD_DIFFICULTY = ConsoleSweeperBones.CSDifficulty["NORMAL"].value
+
+def load_app_settings():
+	'''
+	Reads the settings into the globals the screens use. This happens when the app starts, not on import.
+	'''
+	global APP_GLOBAL_SETTINGS_JSON, MS_BOARD_SIZE_ROWS, MS_BOARD_SIZE_COLS, MS_USING_COLOURS, MS_BOARD_ENGINE, MS_RECORD_REPLAYS
+	global MS_REPLAY_DIR, MS_BOARD_MODE, MS_BOARD_POOL_DIR, MS_SAVE_FILE, MS_SCORE_DB, MS_FRAME_RATE, MS_TIME_TRIAL, MS_TIME_LIMIT
+	global MS_BOARD_DIFFICULTY
+	APP_GLOBAL_SETTINGS_JSON = ConsoleSweeperSettings.load_settings()
+	MS_BOARD_SIZE_ROWS = ConsoleSweeperSettings.get_setting('grid_rows')
+	MS_BOARD_SIZE_COLS = ConsoleSweeperSettings.get_setting('grid_cols')
+	MS_USING_COLOURS = ConsoleSweeperSettings.get_setting('colours')
+	MS_BOARD_ENGINE = ConsoleSweeperSettings.get_setting('board_engine')
+	MS_RECORD_REPLAYS = ConsoleSweeperSettings.get_setting('record_replays')
+	MS_REPLAY_DIR = ConsoleSweeperSettings.get_setting('replay_dir')
+	MS_BOARD_MODE = ConsoleSweeperSettings.get_setting('board_mode')
+	MS_BOARD_POOL_DIR = ConsoleSweeperSettings.get_setting('board_pool_dir')
+	MS_SAVE_FILE = ConsoleSweeperSettings.get_setting('save_file')
+	MS_SCORE_DB = ConsoleSweeperSettings.get_setting('score_db')
+	MS_FRAME_RATE = ConsoleSweeperSettings.get_setting('frame_rate')
+	MS_TIME_TRIAL = ConsoleSweeperSettings.get_setting('time_trial')
+	MS_TIME_LIMIT = ConsoleSweeperSettings.get_setting('time_limit')
+	try:
+		APP_GLOBAL_SETTINGS_JSON['difficulty'] = APP_GLOBAL_SETTINGS_JSON['difficulty'].upper()
+		MS_BOARD_DIFFICULTY = ConsoleSweeperBones.CSDifficulty[APP_GLOBAL_SETTINGS_JSON['difficulty'].upper()].value
+	except:
+		MS_BOARD_DIFFICULTY = ConsoleSweeperBones.CSDifficulty["NORMAL"].value
 
 def main(stdscr) -> int:
+	load_app_settings()
 	CursesUtils.init_curses_protocols(stdscr)
 	
 	GAME_EXIT_SIGNAL = False
+	# finished games are written from the background while the player moves on
+	score_writer = ConsoleSweeperScores.CSScoreWriter(MS_SCORE_DB)
+	# games of the same size are played on the same board, cleared in place between them
+	session = ConsoleSweeperSession.CSSession(MS_BOARD_ENGINE)
 
 	while not GAME_EXIT_SIGNAL:
 		APP_GLOBAL_STATE = GLOBAL_STATES.MAIN_MENU
@@ -70,9 +96,16 @@ def main(stdscr) -> int:
 		# then reroute the user to a different screen depending on app state
 		if (choice == MAIN_MENU_CHOICES.LEAVE):
 			GAME_EXIT_SIGNAL = True
+		elif (choice == MAIN_MENU_CHOICES.CONTINUE):
+			# without a saved game this leads straight back to the menu
+			if os.path.exists(MS_SAVE_FILE):
+				APP_GLOBAL_STATE = GLOBAL_STATES.MINESWEEPER
+				minesweeper_main(stdscr, score_writer, session, True)
+				session.end_game()
 		elif (choice == MAIN_MENU_CHOICES.PLAY):
 			APP_GLOBAL_STATE = GLOBAL_STATES.MINESWEEPER
-			minesweeper_main(stdscr)
+			minesweeper_main(stdscr, score_writer, session)
+			session.end_game()
 		
 		# TODO: these are unimplemented
 		elif (choice == MAIN_MENU_CHOICES.SETTINGS):
@@ -81,13 +114,23 @@ def main(stdscr) -> int:
 			
 		elif (choice == MAIN_MENU_CHOICES.SCOREBOARD):
 			APP_GLOBAL_STATE = GLOBAL_STATES.SCOREBOARD
+			handle_scoreboard_menu(stdscr, score_writer)
 		else:
 			raise AssertionError("Main Menu function returned unresolvable value.")
 			return 1
 
+	session.close()
+
 	#write settings back to JSON
-	with open("./bin/settings.json", 'w') as json_fp:
-		json.dump(APP_GLOBAL_SETTINGS_JSON, json_fp)
+	ConsoleSweeperSettings.save_settings()
+	# if the scoreboard failed, its error comes out here, once everything else is put away;
+	# the games are over by now, so it is reported rather than ending the app on a traceback
+	import sqlite3
+	try:
+		score_writer.close()
+	except (sqlite3.Error, OSError) as error:
+		curses.endwin()
+		print("Warning: finished games could not be saved to {}: {}".format(MS_SCORE_DB, error), file = sys.stderr)
 	return 0
 
 
@@ -97,18 +140,20 @@ version_text   = "--------------v0.1--------------"
 funny_emoticon = "(*^-^*)/"
 
 title_logo = [line_delim_pad, logo_text, version_text, funny_emoticon]
-menu_elems = ['Play', 'Settings', 'ScoreBoard', 'Exit']
-completed_menu_features = [0, 3]
+menu_elems = ['Continue', 'Play', 'Settings', 'ScoreBoard', 'Exit']
+completed_menu_features = [0, 1, 3, 4]
 
 # main menu choices
 class MAIN_MENU_CHOICES(Enum):
-	PLAY = 0
-	SETTINGS = 1
-	SCOREBOARD = 2
-	LEAVE = 3
+	CONTINUE = 0
+	PLAY = 1
+	SETTINGS = 2
+	SCOREBOARD = 3
+	LEAVE = 4
 
 def handle_main_menu(stdscr) -> int:
-	menu_row_ind = 0 # reference menu elements by index
+	# reference menu elements by index; a saved game puts Continue first in line
+	menu_row_ind = (MAIN_MENU_CHOICES.CONTINUE if os.path.exists(MS_SAVE_FILE) else MAIN_MENU_CHOICES.PLAY).value
 	print_main_menu(stdscr, menu_row_ind)
 	selection_made = False
 	height, width = stdscr.getmaxyx()
@@ -124,7 +169,7 @@ def handle_main_menu(stdscr) -> int:
 				menu_row_ind -= 1
 
 		elif (key == curses.KEY_DOWN):
-			menu_row_ind = (menu_row_ind + 1) % 4
+			menu_row_ind = (menu_row_ind + 1) % len(menu_elems)
 
 		elif (key == curses.KEY_ENTER or key in [10, 13]):
 			
@@ -132,6 +177,10 @@ def handle_main_menu(stdscr) -> int:
 				stdscr.addstr(0, 0, "Feature Coming Soon!")
 				stdscr.refresh()
 				stdscr.getch()
+			elif(MAIN_MENU_CHOICES(menu_row_ind) == MAIN_MENU_CHOICES.CONTINUE and not os.path.exists(MS_SAVE_FILE)):
+				stdscr.addstr(0, 0, "No saved game to continue.")
+				stdscr.refresh()
+				stdscr.getch()
 			else:
 				selection_made = True
 				
@@ -203,103 +252,398 @@ game_top_logo = [line_delim_pad_2, game_top_text, line_delim_pad_2, funny_emotic
 game_over_top_logo = [line_delim_pad_2, game_top_text_game_over, line_delim_pad_2, funny_emoticon_game_over]
 game_won_top_logo = [line_delim_pad_2, game_top_text_win, line_delim_pad_2, funny_emoticon_win]
 
-def minesweeper_main(stdscr):
+scoreboard_top_text = "SCOREBOARD"
+funny_emoticon_scores = "(o^-^)b"
+scoreboard_logo = [line_delim_pad, scoreboard_top_text, line_delim_pad, funny_emoticon_scores]
+
+def handle_scoreboard_menu(stdscr, score_writer: ConsoleSweeperScores.CSScoreWriter):
+	'''
+	Shows the fastest wins on the board size and difficulty in the settings, the player's best, and how many games were won.
+	'''
+	import sqlite3
+	rows, cols = MS_BOARD_SIZE_ROWS, MS_BOARD_SIZE_COLS
+	difficulty = ConsoleSweeperScores.difficulty_name(rows, cols, ConsoleSweeperBones.mine_count(rows, cols, MS_BOARD_DIFFICULTY))
+	try:
+		# games finished a moment ago may still be on their way to the disk
+		score_writer.flush()
+		best = ConsoleSweeperScores.best_times(MS_SCORE_DB, rows, cols, difficulty)
+		own_best = ConsoleSweeperScores.personal_best(MS_SCORE_DB, rows, cols, difficulty, score_writer.player)
+		played, won = ConsoleSweeperScores.games_played(MS_SCORE_DB, rows, cols, difficulty)
+	except sqlite3.Error as error:
+		best = None
+		lines = ["The scoreboard in {} could not be used:".format(MS_SCORE_DB), str(error)]
+
+	if best is not None:
+		lines = ["Fastest wins on {}x{}, {}".format(rows, cols, difficulty), ""]
+		lines.append("{:>4}  {:>10}  {:>6}  {:<12}  {}".format("#", "Seconds", "Clicks", "Player", "Date"))
+		for ind, (seconds, clicks, finished, player) in enumerate(best):
+			lines.append("{:>4}  {:>10.3f}  {:>6}  {:<12}  {}".format(ind + 1, seconds, clicks, player[:12],
+				time.strftime("%Y-%m-%d", time.localtime(finished))))
+		if not best:
+			lines.append("No wins yet.")
+		lines.append("")
+		lines.append("Your best: " + ("{:.3f} seconds".format(own_best[0]) if own_best is not None else "none yet"))
+		lines.append("Games won: {} of {}".format(won, played))
+
+	stdscr.clear()
+	height, width = stdscr.getmaxyx()
+	box = [[1,3], [height - 1, width - 3]]
+	textpad.rectangle(stdscr, box[0][0], box [0][1], box[1][0], box[1][1])
+	CursesUtils.write_text_with_colour(stdscr, return_button_row_col[0], return_button_row_col[1], return_button, CursesUtils.MENU_SELECT)
+	display_logo(stdscr, scoreboard_logo)
+	x = max((width // 2) - (max(len(line) for line in lines) // 2), 5)
+	y = (height // 6) - (len(menu_elems) // 2) + len(scoreboard_logo) + 1
+	for ind, line in enumerate(lines):
+		if y + ind < height - 1:
+			stdscr.addstr(y + ind, x, line[:width - 5 - x])
+	stdscr.refresh()
+
+	# the mouse-up from the menu click must not leave the screen straight away
+	while True:
+		key = stdscr.getch()
+		if key == CursesUtils.ESC_KEY or key == curses.KEY_ENTER or key in [10, 13]:
+			return 0
+		if key == curses.KEY_MOUSE:
+			_, x, y, _, bstate = curses.getmouse()
+			if (bstate & curses.BUTTON1_PRESSED) and y == return_button_row_col[0] and x in range(return_button_row_col[1], return_button_row_col[1] + len(return_button)):
+				return 0
+
+class MSViewport():
+	'''
+	The part of the board that is on screen. A board that fits the terminal is centred as it always was;
+	a larger one is shown through a window that fills the free screen area and scrolls with the arrow and page keys.
+	Grid cells are drawn into a curses pad the size of the window and only visible cells are ever rendered,
+	so a frame costs the same however large the board is.
+	'''
+	def __init__(self, board: ConsoleSweeperBones.CSBoard, height: int, width: int):
+		self.board = board
+		self.top_row = 0
+		self.left_col = 0
+		self.resize(height, width)
+
+	def resize(self, height: int, width: int):
+		board = self.board
+		self.height = height
+		self.width = width
+		self.label_width = max(2, len(str(board.rows)))
+
+		# the free area inside the box: below the logo and the column numbers, above the flags and hint lines
+		top = height // 6 + 4
+		bottom = height - 3
+		left = 5 + self.label_width
+		right = width - 4
+		self.view_rows = max(1, min(board.rows, bottom - top))
+		self.view_cols = max(1, min(board.cols, (right - left) // 3))
+
+		# centred where the grid fits, kept inside the free area where it does not
+		self.start_y = max(top, min(calc_grid_start_y(height, board.rows), bottom - self.view_rows))
+		self.start_x = max(left, min(calc_grid_start_x(width, 3 * board.cols), right - 3 * self.view_cols))
+
+		# one spare column, so that writing the last cell never moves the cursor off the pad
+		self.pad = curses.newpad(self.view_rows, 3 * self.view_cols + 1)
+		self.scroll(0, 0)
+
+	def scroll(self, d_rows: int, d_cols: int) -> bool:
+		'''
+		Moves the window by the given number of rows and columns, stopping at the board's edges.
+		Returns whether it moved.
+		'''
+		top_row = max(0, min(self.top_row + d_rows, self.board.rows - self.view_rows))
+		left_col = max(0, min(self.left_col + d_cols, self.board.cols - self.view_cols))
+		moved = (top_row, left_col) != (self.top_row, self.left_col)
+		self.top_row, self.left_col = top_row, left_col
+		return moved
+
+	def scroll_to(self, row: int, col: int) -> bool:
+		'''
+		Scrolls just far enough to bring the cell on screen. Returns whether the window moved.
+		'''
+		d_rows = min(0, row - self.top_row) + max(0, row - (self.top_row + self.view_rows - 1))
+		d_cols = min(0, col - self.left_col) + max(0, col - (self.left_col + self.view_cols - 1))
+		return self.scroll(d_rows, d_cols)
+
+	def scroll_key(self, key: int) -> bool:
+		'''
+		Scrolls for an arrow or page key. Returns whether the window moved.
+		'''
+		steps = {
+			curses.KEY_UP: (-1, 0), curses.KEY_DOWN: (1, 0), curses.KEY_LEFT: (0, -1), curses.KEY_RIGHT: (0, 1),
+			curses.KEY_PPAGE: (-self.view_rows, 0), curses.KEY_NPAGE: (self.view_rows, 0)
+		}
+		return key in steps and self.scroll(*steps[key])
+
+	def position_text(self) -> str:
+		'''
+		Says which rows and columns are on screen, or returns an empty string if the whole board is.
+		'''
+		if self.view_rows == self.board.rows and self.view_cols == self.board.cols:
+			return ""
+		return "Rows {}-{} of {}, cols {}-{} of {}".format(self.top_row + 1, self.top_row + self.view_rows, self.board.rows,
+			self.left_col + 1, self.left_col + self.view_cols, self.board.cols)
+
+	def is_visible(self, row: int, col: int) -> bool:
+		return self.top_row <= row < self.top_row + self.view_rows and self.left_col <= col < self.left_col + self.view_cols
+
+	def cell_at(self, y: int, x: int) -> (int, int):
+		'''
+		Maps a screen position to the board cell shown there, or returns None if it is outside the window.
+		'''
+		if not (self.start_y <= y < self.start_y + self.view_rows and self.start_x <= x < self.start_x + 3 * self.view_cols):
+			return None
+		return get_grid_coords_from_mouseyx(self.start_y, self.start_x, y, x, self.top_row, self.left_col)
+
+	def draw_cell(self, row: int, col: int, text: str, colour: int = None):
+		'''
+		Writes a cell's text into the pad if the cell is on screen, in symbol colours or in the given colour pair.
+		'''
+		if not self.is_visible(row, col):
+			return
+		y = row - self.top_row
+		x = 3 * (col - self.left_col)
+		if colour is None:
+			print_ms_text(self.pad, y, x, text)
+		else:
+			CursesUtils.write_text_with_colour(self.pad, y, x, text, colour)
+
+	def draw(self, stdscr, game_over: bool = False, mine_row: int = -1, mine_col: int = -1):
+		'''
+		Renders the visible cells into the pad, and their row and column numbers onto the screen.
+		'''
+		board = self.board
+		end_col = self.left_col + self.view_cols
+
+		stdscr.addstr(self.start_y - 1, self.start_x, " " * (3 * self.view_cols))
+		# numbers too long for their column skip the columns they would run into
+		free_x = self.start_x
+		for ind in range(self.view_cols):
+			x = self.start_x + 3 * ind + 1
+			label = str(self.left_col + ind + 1)
+			if x >= free_x and x + len(label) <= self.start_x + 3 * self.view_cols:
+				stdscr.addstr(self.start_y - 1, x, label + "  ")
+				free_x = x + len(label) + 1
+
+		for ind in range(self.view_rows):
+			row_ind = self.top_row + ind
+			# numbers are padded to the widest label, as scrolling writes new ones over old ones
+			stdscr.addstr(self.start_y + ind, self.start_x - self.label_width, str(row_ind + 1).ljust(self.label_width))
+			row_str = board.grid_row_to_string(row_ind, game_over, mine_row, mine_col, self.left_col, end_col)
+			print_ms_text(self.pad, ind, 0, row_str)
+
+	def refresh(self, stdscr):
+		'''
+		Puts the screen and the pad on the terminal in one update. The pad goes last, as it sits on top of the screen.
+		'''
+		stdscr.noutrefresh()
+		self.pad.noutrefresh(0, 0, self.start_y, self.start_x, self.start_y + self.view_rows - 1, self.start_x + 3 * self.view_cols - 1)
+		curses.doupdate()
+
+def minesweeper_main(stdscr, score_writer: ConsoleSweeperScores.CSScoreWriter, session: ConsoleSweeperSession.CSSession, resume: bool = False):
+	from bin import ConsoleSweeperSolver, ConsoleSweeperProbability
 	time_start = time.time()
 	elapsed = 0
 	game_over = False
-	voluntary_exit = False
-	row_char_length = 3 * MS_BOARD_SIZE_COLS
+	won = False
+	out_of_time = False
+	mine_row, mine_col = -1, -1
 	height, width = stdscr.getmaxyx()
 
-	num_mines = MS_BOARD_DIFFICULTY * (MS_BOARD_SIZE_ROWS * MS_BOARD_SIZE_COLS)
-	board = ConsoleSweeperBones.CSBoard(MS_BOARD_SIZE_ROWS, MS_BOARD_SIZE_COLS, num_mines)
-	game_grid = board.grid
-	print_ms_grid(stdscr, board, height, width)
-
-	while not (game_over or voluntary_exit):
-		key = stdscr.getch() 
-		height, width = stdscr.getmaxyx()		
-
-		if(key == curses.KEY_MOUSE):
-			_, x, y, _, bstate = curses.getmouse()
-			
-			grid_start_x = (width // 2) - (row_char_length // 2)
-			grid_start_y = int(height * 0.6) - (board.rows // 2)
-			
-			grid_coords = get_grid_coords_from_mouseyx(grid_start_y, grid_start_x, y, x)
-			temp_row = grid_coords[0]
-			temp_col = grid_coords[1]
-
-			# the board ignores out of bounds mouse events
-			if(board.in_bounds(temp_row, temp_col)):
-
-				temp_tile = game_grid[temp_row][temp_col]
-
-				# flag
-				if (bstate & curses.BUTTON3_PRESSED):
-
-					if (board.flags_left > 0):
-						if (not temp_tile.is_clicked()):
-							game_grid[temp_row][temp_col].plant_flag(not game_grid[temp_row][temp_col].is_flagged())
-							board.flags_left = board.flags_left - 1 if game_grid[temp_row][temp_col].is_flagged() else board.flags_left + 1
-					else:
-						if temp_tile.is_flagged():
-							board.flags_left += 1
-							game_grid[temp_row][temp_col].plant_flag(False)
-				#reveal
-				elif((bstate & curses.BUTTON1_PRESSED) and not temp_tile.is_flagged()): 
-
-						# populate board with mines at random locations,
-						# but only after the first click.
-						if board.clicks_so_far == 0:
-							board.emplace_mines([temp_row, temp_col])
-						
-						is_fine = board.reveal_tile(temp_row, temp_col)
-						board.clicks_so_far += 1
-
-						if (not is_fine):
-							game_over = True
-							elapsed = time.time() - time_start
-							print_ms_grid_true(stdscr, board, game_over, temp_row, temp_col, height, width, elapsed)
-							break
-
-				print_ms_grid(stdscr, board, height, width)
-				if (board.check_win_cond()):
-					elapsed = time.time() - time_start
-					print_ms_grid_true(stdscr, board, game_over, -1, -1, height, width, elapsed)
-					break
+	num_mines = ConsoleSweeperBones.mine_count(MS_BOARD_SIZE_ROWS, MS_BOARD_SIZE_COLS, MS_BOARD_DIFFICULTY)
+	# only a new no-guess game takes a board from the pool and marks where to start
+	start_cell = None
+	game_mode = "continued" if resume else MS_BOARD_MODE
+	status_text = None
+
+	if resume:
+		from bin import ConsoleSweeperSave
+		try:
+			board, played = ConsoleSweeperSave.load_game(MS_SAVE_FILE, MS_BOARD_ENGINE)
+		except (OSError, ValueError):
+			return
+		session.adopt(board)
+		# a save is used up once continued; leaving the game again saves it afresh
+		ConsoleSweeperSave.discard_save(MS_SAVE_FILE)
+		time_start -= played
+	elif MS_BOARD_MODE == "infinite":
+		from bin import ConsoleSweeperInfinite
+		board = ConsoleSweeperInfinite.CSInfiniteBoard(MS_BOARD_DIFFICULTY)
+		session.adopt(board)
+	else:
+		seed = None
+		if MS_BOARD_MODE == "no_guess":
+			from bin import ConsoleSweeperNoGuess
+			pooled = ConsoleSweeperNoGuess.next_board(MS_BOARD_POOL_DIR, MS_BOARD_SIZE_ROWS, MS_BOARD_SIZE_COLS, num_mines)
+			if pooled is not None:
+				seed, start_cell = pooled[0], tuple(pooled[1:])
 			else:
-				if (y == return_button_row_col[0] and x in range(return_button_row_col[1], return_button_row_col[1] + len(return_button))):
-					return
-		elif key == CursesUtils.ESC_KEY:
-			# for some reason ESC key events have an implicit delay associated with them.
-			# I seriously have no idea why.
+				# the pool is refilling in the background; this game is a regular one, and is scored as one
+				game_mode = "random"
+				status_text = "Pool empty: random board"
+		board = session.new_board(MS_BOARD_SIZE_ROWS, MS_BOARD_SIZE_COLS, num_mines, seed)
+	infinite = board.infinite
+	# lay the mines out while the player looks at the fresh grid; the first click only moves a few of them
+	if not resume:
+		board.prepare_layout_in_background()
+	# replays start from a fresh board, so neither an infinite world nor a continued game can be recorded
+	if MS_RECORD_REPLAYS and not (infinite or resume):
+		from bin import ConsoleSweeperReplay
+		ConsoleSweeperReplay.open_replay_writer(board, MS_REPLAY_DIR)
+	solver = ConsoleSweeperSolver.CSSolver(board)
+	odds_shown = False
+	game_grid = board.grid
+	view = MSViewport(board, height, width)
+	if infinite:
+		# start in the middle of the world, so there is room to scroll every way
+		view.scroll((board.rows - view.view_rows) // 2, (board.cols - view.view_cols) // 2)
+	print_ms_grid(stdscr, view)
+	if start_cell is not None:
+		print_ms_hint(stdscr, view, (ConsoleSweeperBones.CSChoice.CLICK, *start_cell), "Start")
+	elif status_text is not None:
+		print_ms_status(stdscr, view, status_text)
+	painted_size = (height, width)
+
+	frame_time = 1 / MS_FRAME_RATE if MS_FRAME_RATE > 0 else 0
+	last_frame = 0
+	# a countdown shows tenths of a second, a plain timer whole seconds
+	timer_tick = TRIAL_TIMER_TICK if MS_TIME_TRIAL else TIMER_TICK
+	deadline = time_start + MS_TIME_LIMIT if MS_TIME_TRIAL else None
+	print_ms_timer(stdscr, view, time.time() - time_start)
+
+	while not (game_over or won):
+		# sleep until input comes in, the timer next changes or the time runs out, whichever is first
+		now = time.time()
+		wake = time_start + (math.floor((now - time_start) / timer_tick) + 1) * timer_tick
+		if deadline is not None:
+			wake = min(wake, deadline)
+		# everything that came in since the last frame is applied as one batch, and drawn once
+		events = CursesUtils.read_events(stdscr, max(1, math.ceil((wake - now) * 1000)))
+		height, width = stdscr.getmaxyx()
+		repaint = (height, width) != painted_size
+		scrolled = False
+		overlay = None
+
+		actions = []
+		leave = False
+		# a no-guess board can only be solved from its own first click
+		first_click = board.clicks_so_far == 0 and start_cell is not None
+		for key, y, x, bstate in events:
+			if(key == curses.KEY_MOUSE):
+				# the window maps the click through its scroll offset, and ignores clicks outside it
+				grid_coords = view.cell_at(y, x)
+				if(grid_coords is not None):
+					temp_row = grid_coords[0]
+					temp_col = grid_coords[1]
+
+					# flag
+					if (bstate & curses.BUTTON3_PRESSED):
+						actions.append((ConsoleSweeperBones.CSChoice.FLAG, temp_row, temp_col))
+					# a middle click, or a click on a revealed number, clicks all of its unflagged neighbours
+					elif((bstate & curses.BUTTON2_PRESSED) or game_grid[temp_row][temp_col].is_clicked()):
+						actions.append((ConsoleSweeperBones.CSChoice.CHORD, temp_row, temp_col))
+					#reveal
+					elif(bstate & curses.BUTTON1_PRESSED): 
+						if first_click and (temp_row, temp_col) != start_cell:
+							continue
+						first_click = False
+						actions.append((ConsoleSweeperBones.CSChoice.CLICK, temp_row, temp_col))
+				else:
+					if (y == return_button_row_col[0] and x in range(return_button_row_col[1], return_button_row_col[1] + len(return_button))):
+						leave = True
+						break
+			elif key in (ord('h'), ord('H')):
+				overlay = key
+			elif key in (ord('p'), ord('P')):
+				overlay = key
+			elif view.scroll_key(key):
+				scrolled = True
+			elif key == CursesUtils.ESC_KEY:
+				# for some reason ESC key events have an implicit delay associated with them.
+				# I seriously have no idea why.
+				leave = True
+				break
+
+		# the board plays the whole batch in one call, and stops at the first action that wins or loses.
+		# the board populates itself with mines on the first click
+		result = board.apply_actions(actions)
+		solver.update(result.revealed)
+		changed_cells = result.changed_cells()
+		won = result.status == ConsoleSweeperBones.CSStatus.WON
+		game_over = result.status == ConsoleSweeperBones.CSStatus.LOST
+		if game_over:
+			mine_row, mine_col = result.mine
+		# moves made before leaving are kept in the save
+		if leave and not (game_over or won):
+			save_unfinished_game(board, time.time() - time_start)
 			return
-
-	# there's probably a much cleaner, less bad way to prevent the mouseUp event
-	# from un-halting the program, but I don't have time to figure it out.
-	time.sleep(SCENE_TRANSITION_DELAY)
-	stdscr.getch()
-	stdscr.getch()
+		elapsed = time.time() - time_start
+		# a time trial is lost the moment the limit passes, unless the last move before it won
+		if deadline is not None and not (game_over or won) and elapsed >= MS_TIME_LIMIT:
+			game_over = out_of_time = True
+			elapsed = MS_TIME_LIMIT
+		if game_over or won:
+			print_ms_grid_true(stdscr, view, game_over, mine_row, mine_col, elapsed, out_of_time)
+			record_finished_game(score_writer, board, won, elapsed, game_mode)
+			break
+
+		# only a resize needs the whole screen repainted, and the odds overlay covers the whole grid,
+		# so a board change under it is cleared the same way. Cells scrolled into view are drawn plain.
+		if repaint:
+			view.resize(height, width)
+			painted_size = (height, width)
+		if repaint or (changed_cells and odds_shown):
+			print_ms_grid(stdscr, view)
+			odds_shown = False
+		elif scrolled:
+			print_ms_view(stdscr, view)
+			odds_shown = False
+		elif changed_cells:
+			print_ms_grid_cells(stdscr, view, changed_cells)
+
+		# hints and odds go on top of the board as it stands after the batch; only the last one asked for is shown
+		if overlay in (ord('h'), ord('H')):
+			print_ms_hint(stdscr, view, solver.hint())
+		elif overlay in (ord('p'), ord('P')):
+			print_ms_odds(stdscr, view, ConsoleSweeperProbability.mine_probabilities(solver))
+			odds_shown = True
+		print_ms_timer(stdscr, view, elapsed)
+
+		# events that come in while the frame waits out its time are coalesced into the next batch
+		if events:
+			wait = last_frame + frame_time - time.time()
+			if wait > 0:
+				curses.napms(int(wait * 1000))
+			last_frame = time.time()
+
+	# the results stay up until the player presses something after seeing them
+	CursesUtils.wait_for_press(stdscr)
 	
 
-def print_ms_grid(stdscr, board: ConsoleSweeperBones.CSBoard, height: int, width: int):
+def save_unfinished_game(board: ConsoleSweeperBones.CSBoard, elapsed: float):
+	'''
+	Keeps a game the player walks away from, so that Continue on the main menu can pick it up.
+	Games without a first click have nothing worth keeping, and an infinite world has no end to save.
+	'''
+	if board.mines_placed and not board.infinite:
+		from bin import ConsoleSweeperSave
+		ConsoleSweeperSave.save_game(MS_SAVE_FILE, board, elapsed)
+
+def record_finished_game(score_writer: ConsoleSweeperScores.CSScoreWriter, board: ConsoleSweeperBones.CSBoard, won: bool, elapsed: float, mode: str):
+	'''
+	Hands a finished game to the scoreboard. An infinite world has no size to rank it by, so it is left out.
+	'''
+	if board.infinite:
+		return
+	difficulty = ConsoleSweeperScores.difficulty_name(board.rows, board.cols, board.mines)
+	score_writer.record(board.rows, board.cols, board.mines, difficulty, mode, won, elapsed, board.clicks_so_far)
+
+def print_ms_grid(stdscr, view: MSViewport):
 	stdscr.clear()
-	
-	num_rows = board.rows
-	num_cols = board.cols
 
-	row_char_length = 3 * num_cols
+	height, width = view.height, view.width
 
 	# draw a box, again
 	box = [[1, 3], [height - 1, width - 3]]
 	textpad.rectangle(stdscr, box[0][0], box [0][1], box[1][0], box[1][1])
 
-	# anchor grid to the centre of the screen
-	msgrid = board.grid
-	grid_start_x = calc_grid_start_x(width, row_char_length)
-	grid_start_y = calc_grid_start_y(height, num_rows)
-
 	#display logo
 	for ind, text in enumerate(game_top_logo):
 		x = (width // 2) - (len(text) // 2)
@@ -309,78 +653,153 @@ def print_ms_grid(stdscr, board: ConsoleSweeperBones.CSBoard, height: int, width
 	# display return text
 	CursesUtils.write_text_with_colour(stdscr, return_button_row_col[0], return_button_row_col[1], return_button, CursesUtils.MENU_SELECT)
 
-	for col_ind in range(0, num_cols * 3, 3):
-		stdscr.addstr(grid_start_y - 1, grid_start_x + col_ind + 1, str(col_ind // 3 + 1) + "  ")
-
 	#render grid tiles
-	for row_ind in range(num_rows):
-
-		# this should be updated to support coloured numbers.
-		# the string-splicing might get expensive eventually, though.
-		row_str = board.grid_row_to_string(row_ind, False, -1, -1)
-		grid_start_y_true = grid_start_y + row_ind
-		stdscr.addstr(grid_start_y_true, grid_start_x - 2, str(row_ind + 1))
-
-		#colours support
-		if(MS_USING_COLOURS):
-			for offset, symbol in enumerate(row_str):
-				colour_to_use = get_colour_by_symbol(symbol)
-				CursesUtils.write_text_with_colour(stdscr, grid_start_y_true, grid_start_x + offset, symbol, colour_to_use)
-		else:
-			stdscr.addstr(grid_start_y_true, grid_start_x, row_str)
-	
-	# print flags left
-	stdscr.addstr(grid_start_y + num_rows, grid_start_x, "Flags left: " + str(int(board.flags_left)))
+	view.draw(stdscr)
+	print_flags_left(stdscr, view)
 	
-	stdscr.refresh()
+	view.refresh(stdscr)
+
+	return 0
+
+def print_ms_view(stdscr, view: MSViewport):
+	'''
+	Redraws the window's cells, its row and column numbers and the flags line, e.g. after a scroll.
+	'''
+	view.draw(stdscr)
+	print_flags_left(stdscr, view)
+	view.refresh(stdscr)
+
+def print_ms_grid_cells(stdscr, view: MSViewport, cells: [(int, int)]):
+	'''
+	Redraws only the given grid cells and the flags counter, leaving the rest of the screen as it is.
+	Cells outside the window are skipped.
+	'''
+	board = view.board
+	# past a point, redrawing the whole window is cheaper than going cell by cell
+	if (len(cells) * 2 >= view.view_rows * view.view_cols):
+		view.draw(stdscr)
+	else:
+		for row_ind, col_ind in cells:
+			view.draw_cell(row_ind, col_ind, board.grid[row_ind][col_ind].to_string())
+
+	print_flags_left(stdscr, view)
+	# any hint on screen is out of date once the board changes
+	stdscr.addstr(view.start_y + view.view_rows + 1, view.start_x, " " * HINT_TEXT_WIDTH)
+
+	view.refresh(stdscr)
 
 	return 0
 
-def print_ms_grid_true(stdscr, board: ConsoleSweeperBones.CSBoard, loss: bool, mine_row: int, mine_col: int, height: int, width: int, elapsed: float):
+HINT_TEXT_WIDTH = 28
+
+def print_ms_hint(stdscr, view: MSViewport, hint: (ConsoleSweeperBones.CSChoice, int, int), label: str = "Hint"):
+	'''
+	Highlights the hinted cell, scrolling it into view if need be, and says below the grid what to do with it.
+	The highlight lasts until the cell is next redrawn.
+	'''
+	board = view.board
+	if hint is None:
+		text = label + ": no sure move. Guess!"
+	else:
+		action, row_ind, col_ind = hint
+		verb = "click" if action == ConsoleSweeperBones.CSChoice.CLICK else "flag"
+		text = "{}: {} {}, {}".format(label, verb, col_ind + 1, row_ind + 1)
+		if view.scroll_to(row_ind, col_ind):
+			view.draw(stdscr)
+			print_flags_left(stdscr, view)
+		view.draw_cell(row_ind, col_ind, board.grid[row_ind][col_ind].to_string(), CursesUtils.MENU_SELECT)
+
+	print_ms_status(stdscr, view, text)
+
+def print_ms_status(stdscr, view: MSViewport, text: str):
+	'''
+	Writes a line below the grid, where hints go.
+	'''
+	stdscr.addstr(view.start_y + view.view_rows + 1, view.start_x, text.ljust(HINT_TEXT_WIDTH))
+	view.refresh(stdscr)
+
+def print_ms_odds(stdscr, view: MSViewport, odds: "ConsoleSweeperProbability.CSMineOdds"):
+	'''
+	Overlays every visible unrevealed, unflagged cell with its chance of holding a mine, in percent.
+	'''
+	board = view.board
+	for row_ind in range(view.top_row, view.top_row + view.view_rows):
+		for col_ind in range(view.left_col, view.left_col + view.view_cols):
+			tile = board.grid[row_ind][col_ind]
+			if tile.is_clicked() or tile.is_flagged():
+				continue
+			# only a proven mine reads 100
+			percent = odds.odds(row_ind, col_ind) * 100
+			text = "100" if percent == 100 else "{:2d}%".format(min(round(percent), 99))
+			view.draw_cell(row_ind, col_ind, text, CursesUtils.DEFAULT)
+
+	print_ms_status(stdscr, view, "Mine odds" if odds.exact else "Mine odds (estimated)")
+
+def print_ms_text(stdscr, y: int, x: int, text: str):
+	'''
+	Writes grid text, colouring each symbol if colours are on.
+	'''
+	#colours support
+	if(MS_USING_COLOURS):
+		CursesUtils.write_text_with_symbol_colours(stdscr, y, x, text)
+	else:
+		stdscr.addstr(y, x, text)
+
+def print_flags_left(stdscr, view: MSViewport):
+	# an infinite world's flag allowance is too large to mean anything, so it counts the flags placed instead
+	if view.board.infinite:
+		text = "Flags placed: " + str(view.board.flags_placed)
+	else:
+		text = "Flags left: " + str(int(view.board.flags_left))
+	# a scrolling window also says which part of the board it shows, if there is room
+	position = view.position_text()
+	if position and len(text) + len(position) + 3 <= 3 * view.view_cols:
+		text += position.rjust(3 * view.view_cols - len(text))
+	else:
+		# trailing spaces wipe out digits left over from a longer count
+		text += "   "
+	stdscr.addstr(view.start_y + view.view_rows, view.start_x, text)
+
+TIMER_TICK = 1
+TRIAL_TIMER_TICK = 0.1
+
+def print_ms_timer(stdscr, view: MSViewport, elapsed: float):
+	'''
+	Shows the time played at the top right of the box, or in a time trial, the time left.
+	'''
+	if MS_TIME_TRIAL:
+		text = "Time left: {:.1f}s".format(max(0, MS_TIME_LIMIT - elapsed))
+	else:
+		text = "Time: {}s".format(math.floor(elapsed))
+	# leading spaces wipe out characters left over from a longer time
+	text = text.rjust(18)
+	stdscr.addstr(return_button_row_col[0], view.width - 5 - len(text), text)
+	view.refresh(stdscr)
+
+def print_ms_grid_true(stdscr, view: MSViewport, loss: bool, mine_row: int, mine_col: int, elapsed: float, out_of_time: bool = False):
 	stdscr.clear()
 	
-	num_rows = board.rows
-	num_cols = board.cols
-
-	row_char_length = 3 * num_cols
+	height, width = view.height, view.width
 
 	# draw a box, again
 	box = [[1,3], [height - 1, width - 3]]
 	textpad.rectangle(stdscr, box[0][0], box [0][1], box[1][0], box[1][1])
 
-	msgrid = board.grid
-	grid_start_x = calc_grid_start_x(width, row_char_length)
-	grid_start_y = calc_grid_start_y(height, num_rows)
-	
 	to_display = game_won_top_logo if not loss else game_over_top_logo
 	
 	#display logo
 	display_logo(stdscr, to_display)
 
-	for col_ind in range(0, num_cols * 3, 3):
-		stdscr.addstr(grid_start_y - 1, grid_start_x + col_ind + 1, str(col_ind // 3 + 1) + "  ")
-
-	#render grid tiles
-	for row_ind in range(num_rows):
-
-		# this should be updated to support coloured numbers.
-		# the string-splicing might get expensive eventually, though.
-		row_str = board.grid_row_to_string(row_ind, True, mine_row, mine_col)
-		grid_start_y_true = grid_start_y + row_ind
-		stdscr.addstr(grid_start_y_true, grid_start_x - 2, str(row_ind + 1))
-
-		#colours support
-		if(MS_USING_COLOURS):
-			for offset, symbol in enumerate(row_str):
-				colour_to_use = get_colour_by_symbol(symbol)		
-				CursesUtils.write_text_with_colour(stdscr, grid_start_y_true, grid_start_x + offset, symbol, colour_to_use)
-		else:
-			stdscr.addstr(grid_start_y_true, grid_start_x, row_str)
+	#render grid tiles, with the mine that went off in view
+	if loss and not out_of_time:
+		view.scroll_to(mine_row, mine_col)
+	view.draw(stdscr, True, mine_row, mine_col)
 	
 	# print flags left and time used
-	stdscr.addstr(grid_start_y + num_rows, grid_start_x, "Flags left: " + str(int(board.flags_left)))
-	stdscr.addstr(grid_start_y + num_rows + 1, grid_start_x, "Time elapsed: " + str(math.floor(elapsed * 1000) / 1000) + " seconds")
-	stdscr.refresh()
+	print_flags_left(stdscr, view)
+	time_text = "Out of time after " if out_of_time else "Time elapsed: "
+	stdscr.addstr(view.start_y + view.view_rows + 1, view.start_x, time_text + str(math.floor(elapsed * 1000) / 1000) + " seconds")
+	view.refresh(stdscr)
 
 	return 0
 
@@ -392,39 +811,20 @@ def display_logo(stdscr, to_display):
 		stdscr.addstr(y, x, text)
 	stdscr.refresh()
 
-# this is some lame shit right here, but it works, I guess.
-def get_colour_by_symbol(symbol):
-	if(symbol not in ['(', ')']):
-		if (symbol == "0"):
-			colour_to_use = CursesUtils.DEFAULT
-		elif (symbol == "1"):
-			colour_to_use = CursesUtils.TEXT_GREEN
-		elif (symbol == "2"):
-			colour_to_use = CursesUtils.TEXT_BLUE
-		elif (symbol == "3"):
-			colour_to_use = CursesUtils.TEXT_RED
-		elif (symbol == "P"):
-			colour_to_use = CursesUtils.TEXT_YELLOW
-		elif (symbol == "*"):
-			colour_to_use = CursesUtils.MENU_SELECT
-		elif (symbol == "#"):
-			colour_to_use = CursesUtils.BUTTON_BLACK_RED
-		else:
-			colour_to_use = CursesUtils.TEXT_MAGENTA
-	else:
-		colour_to_use = CursesUtils.DEFAULT
-	return colour_to_use
-
 def calc_grid_start_y(window_height: int, num_rows: int):
 	return int(window_height * 0.6) - (num_rows // 2)
 
 def calc_grid_start_x(window_width: int, row_char_length: int):
 	return (window_width // 2) - (row_char_length // 2)
 
-def get_grid_coords_from_mouseyx(grid_start_y: int, grid_start_x: int, mouse_y: int, mouse_x: int) -> (int, int):
-	true_grid_y = mouse_y - grid_start_y
-	true_grid_x = (mouse_x - grid_start_x) // 3
+def get_grid_coords_from_mouseyx(grid_start_y: int, grid_start_x: int, mouse_y: int, mouse_x: int, top_row: int = 0, left_col: int = 0) -> (int, int):
+	'''
+	Maps a screen position to a board cell, for a grid scrolled so that (top_row, left_col) is drawn at the grid's start.
+	'''
+	true_grid_y = mouse_y - grid_start_y + top_row
+	true_grid_x = (mouse_x - grid_start_x) // 3 + left_col
 	return (true_grid_y, true_grid_x)
 
 
-curses.wrapper(main)
+if __name__ == "__main__":
+	curses.wrapper(main)
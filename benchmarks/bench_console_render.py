@@ -0,0 +1,59 @@
+'''
+Measures what the console frontend writes to the terminal per move, with whole frames and with ANSI in-place updates.
+Each board is played with the same seeded sequence of safe clicks and flags in both modes.
+Run from the repository root:
+
+	python -m benchmarks.bench_console_render [size ...]
+'''
+
+import sys
+from random import Random
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSChoice, CSDifficulty, CSStatus
+from bin.ConsoleSweeperConsole import CSConsoleRenderer
+
+DEFAULT_SIZES = [10, 30, 50]
+MAX_MOVES = 100
+
+class CSNullStream():
+	'''
+	A text stream that throws everything away; the renderer does the counting.
+	'''
+	def write(self, text: str) -> int:
+		return len(text)
+
+	def flush(self):
+		pass
+
+def play(size: int, ansi: bool) -> (int, int, int):
+	'''
+	Plays up to MAX_MOVES moves and returns (moves, writes, bytes written), not counting the first frame.
+	'''
+	board = ConsoleSweeperBones.create_board(size, size, int(CSDifficulty.NORMAL.value * size * size), "tiles", size)
+	rng = Random(size)
+	renderer = CSConsoleRenderer(board, CSNullStream(), ansi)
+	renderer.draw()
+	first_writes, first_bytes = renderer.writes, renderer.bytes_written
+
+	moves = 0
+	result = board.apply_actions([(CSChoice.CLICK, size // 2, size // 2)])
+	while result.status == CSStatus.PLAYING and moves < MAX_MOVES:
+		renderer.draw(result.changed_cells())
+		moves += 1
+		hidden = [(row, col) for row in range(size) for col in range(size) if not board.grid[row][col].is_clicked()]
+		row, col = rng.choice(hidden)
+		# flag the mines and click the rest, so the game runs its full course
+		action = CSChoice.FLAG if board.grid[row][col].is_mine() else CSChoice.CLICK
+		result = board.apply_actions([(action, row, col)])
+	return (moves, renderer.writes - first_writes, renderer.bytes_written - first_bytes)
+
+def main(sizes: [int]):
+	print("{:>6} {:>8} {:>8} {:>14} {:>16}".format("size", "mode", "moves", "writes/move", "bytes/move"))
+	for size in sizes:
+		for mode, ansi in (("frames", False), ("ansi", True)):
+			moves, writes, num_bytes = play(size, ansi)
+			print("{:>6} {:>8} {:>8} {:>14.1f} {:>16.1f}".format(size, mode, moves, writes / moves, num_bytes / moves))
+
+if __name__ == "__main__":
+	main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,180 @@
+'''
+Benchmark suite for the board engine hot paths: board construction, mine placement at each difficulty
+and at the first click after a prepared layout, worst-case reveal, the win check, single against batched actions, and row rendering,
+for every board engine and a range of board sizes.
+Each case reports its best time and peak traced memory. Results can be saved and compared against a previous run.
+Run from the repository root:
+
+	python -m benchmarks.bench_engine --save before.json
+	python -m benchmarks.bench_engine --compare before.json
+'''
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSChoice, CSDifficulty
+
+DEFAULT_SIZES = [10, 50, 200, 500, 1000, 2000]
+
+# slower than this ratio against the baseline counts as a regression
+REGRESSION_RATIO = 1.2
+
+def new_board(engine: str, size: int, num_mines: int):
+	return ConsoleSweeperBones.create_board(size, size, num_mines, engine, size)
+
+def mined_board(engine: str, size: int, difficulty: CSDifficulty):
+	board = new_board(engine, size, int(difficulty.value * size * size))
+	board.emplace_mines([size // 2, size // 2])
+	return board
+
+def cases(engine: str, size: int):
+	'''
+	Yields (name, setup, run, repeatable) for each case. setup builds fresh state outside the timed region,
+	and run(state) is the timed call. Repeatable runs leave the state as they found it,
+	so they can be called many times on one setup.
+	'''
+	normal_mines = int(CSDifficulty.NORMAL.value * size * size)
+	yield ("init", lambda: None, lambda state: new_board(engine, size, normal_mines), True)
+
+	for difficulty in CSDifficulty:
+		yield ("emplace_mines/" + difficulty.name,
+			lambda difficulty = difficulty: new_board(engine, size, int(difficulty.value * size * size)),
+			lambda board: board.emplace_mines([size // 2, size // 2]), False)
+
+	# what is left of mine placement at the first click once the layout was prepared ahead of time
+	def prepared_board():
+		board = new_board(engine, size, normal_mines)
+		board.prepare_layout()
+		return board
+	yield ("emplace_mines/prepared", prepared_board, lambda board: board.emplace_mines([size // 2, size // 2]), False)
+
+	# with no mines the first click opens the entire board
+	def empty_board():
+		board = new_board(engine, size, 0)
+		board.emplace_mines([0, 0])
+		return board
+	yield ("reveal_tile/full_opening", empty_board, lambda board: board.reveal_tile(size // 2, size // 2), False)
+
+	def half_played_board():
+		board = mined_board(engine, size, CSDifficulty.NORMAL)
+		board.reveal_tile(size // 2, size // 2)
+		return board
+	yield ("check_win_cond", half_played_board, lambda board: board.check_win_cond(), True)
+
+	# a bot flagging a whole row and taking the flags off again, one call per action against one batch
+	flag_actions = [(CSChoice.FLAG, 0, col) for col in range(size)] * 2
+	def flag_each(board):
+		for action, row, col in flag_actions:
+			board.toggle_flag(row, col)
+			board.check_win_cond()
+	yield ("toggle_flag/each", half_played_board, flag_each, True)
+	yield ("apply_actions/flags", half_played_board, lambda board: board.apply_actions(flag_actions), True)
+
+	yield ("grid_row_to_string/frame", half_played_board,
+		lambda board: [board.grid_row_to_string(row, False, -1, -1) for row in range(board.rows)], True)
+
+# repeatable cases are looped for at least this long per measurement, so that tiny timings are not just noise
+MIN_LOOP_SECONDS = 0.02
+
+def time_case(setup, run, repeatable: bool, repeats: int) -> float:
+	'''
+	Best seconds per call over several measurements.
+	'''
+	best = float("inf")
+	for i in range(repeats):
+		state = setup()
+		calls = 0
+		start = time.perf_counter()
+		while True:
+			run(state)
+			calls += 1
+			elapsed = time.perf_counter() - start
+			if not repeatable or elapsed >= MIN_LOOP_SECONDS:
+				break
+		best = min(best, elapsed / calls)
+		del state
+	return best
+
+def peak_memory(setup, run) -> int:
+	'''
+	Peak traced bytes allocated by one run, on top of its setup.
+	'''
+	state = setup()
+	tracemalloc.start()
+	run(state)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del state
+	return peak
+
+def available_engines() -> [str]:
+	engines = ["tiles"]
+	try:
+		import bin.ConsoleSweeperArrays
+		engines.append("arrays")
+	except ImportError:
+		pass
+	return engines
+
+def run_suite(engines: [str], sizes: [int], measure_memory: bool) -> dict:
+	results = {}
+	for engine in engines:
+		for size in sizes:
+			# large boards take seconds per case, so only small ones are repeated
+			repeats = 5 if size <= 200 else 1
+			for name, setup, run, repeatable in cases(engine, size):
+				key = "{}/{}x{}/{}".format(engine, size, size, name)
+				result = {"seconds": time_case(setup, run, repeatable, repeats)}
+				if measure_memory:
+					result["peak_bytes"] = peak_memory(setup, run)
+				results[key] = result
+				print("{:<48} {:>11.7f}s {:>12}".format(key, result["seconds"],
+					"{:.1f} KiB".format(result["peak_bytes"] / 1024) if measure_memory else ""), flush = True)
+	return results
+
+def compare(baseline: dict, results: dict) -> int:
+	'''
+	Prints the time ratio of every case present in both runs and returns the number of regressions.
+	'''
+	regressions = 0
+	print("\n{:<48} {:>11} {:>11} {:>8}".format("case", "before", "after", "ratio"))
+	for key, result in results.items():
+		if key not in baseline:
+			continue
+		before = baseline[key]["seconds"]
+		ratio = result["seconds"] / before if before > 0 else float("inf")
+		flag = ""
+		if ratio > REGRESSION_RATIO:
+			flag = "  REGRESSION"
+			regressions += 1
+		print("{:<48} {:>11.7f} {:>11.7f} {:>7.2f}x{}".format(key, before, result["seconds"], ratio, flag))
+	return regressions
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description = "Benchmark the board engine hot paths.")
+	parser.add_argument("--sizes", type = int, nargs = "+", default = DEFAULT_SIZES)
+	parser.add_argument("--engines", nargs = "+", default = available_engines(), choices = ConsoleSweeperBones.BOARD_ENGINES)
+	parser.add_argument("--no-memory", action = "store_true", help = "skip the traced peak memory runs")
+	parser.add_argument("--save", help = "write the results to this JSON file")
+	parser.add_argument("--compare", help = "compare against results saved by an earlier run")
+	args = parser.parse_args()
+
+	results = run_suite(args.engines, args.sizes, not args.no_memory)
+
+	if args.save:
+		with open(args.save, 'w') as json_fp:
+			json.dump(results, json_fp, indent = 1)
+
+	if args.compare:
+		with open(args.compare) as json_fp:
+			baseline = json.load(json_fp)
+		if compare(baseline, results) > 0:
+			return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,80 @@
+'''
+Measures the CPU used by the curses game screen while nobody touches it.
+A time-trial game is started in a pseudo-terminal and left alone until its time runs out,
+while its timer keeps ticking on screen; the game's CPU time is then compared with the time it ran for.
+Run from the repository root:
+
+	python -m benchmarks.bench_idle_loop [seconds]
+'''
+
+import os
+import pty
+import select
+import sys
+import tempfile
+import time
+
+import CursedSweeper
+
+DEFAULT_SECONDS = 10
+
+def play_idle_game(seconds: float, data_dir: str):
+	'''
+	Runs in the child: plays one time trial of the given length on the pseudo-terminal, then exits.
+	'''
+	import curses
+	from bin import ConsoleSweeperScores
+	from bin import ConsoleSweeperSession
+	from bin import ConsoleSweeperSettings
+	from bin import CursesUtils
+
+	settings = ConsoleSweeperSettings.load_settings()
+	settings.update(time_trial = True, time_limit = seconds, board_mode = "random",
+		save_file = os.path.join(data_dir, "idle.sav"), score_db = os.path.join(data_dir, "idle.db"))
+
+	def run(stdscr):
+		CursedSweeper.load_app_settings()
+		CursesUtils.init_curses_protocols(stdscr)
+		score_writer = ConsoleSweeperScores.CSScoreWriter(CursedSweeper.MS_SCORE_DB)
+		CursedSweeper.minesweeper_main(stdscr, score_writer, ConsoleSweeperSession.CSSession())
+		score_writer.close()
+	curses.wrapper(run)
+
+def drain(fd: int) -> bool:
+	'''
+	Reads whatever the game has drawn, so its output never blocks. Returns False once the game has closed the terminal.
+	'''
+	ready, _, _ = select.select([fd], [], [], 0.2)
+	if ready:
+		try:
+			return len(os.read(fd, 65536)) > 0
+		except OSError:
+			return False
+	return True
+
+def main(seconds: float):
+	with tempfile.TemporaryDirectory() as data_dir:
+		start = time.perf_counter()
+		pid, fd = pty.fork()
+		if pid == 0:
+			os.environ.setdefault("TERM", "xterm")
+			os.environ["LINES"], os.environ["COLUMNS"] = "40", "120"
+			play_idle_game(seconds, data_dir)
+			os._exit(0)
+
+		# once the time is up the results screen waits for a key
+		key_sent = False
+		while drain(fd):
+			if not key_sent and time.perf_counter() - start > seconds + 0.5:
+				os.write(fd, b"q")
+				key_sent = True
+		_, _, usage = os.wait4(pid, 0)
+		elapsed = time.perf_counter() - start
+
+	cpu = usage.ru_utime + usage.ru_stime
+	print("ran for {:.2f} s, used {:.3f} s of CPU ({:.2f}%)".format(elapsed, cpu, 100 * cpu / elapsed))
+	# start-up and shut-down are included, so longer runs give a truer figure for the idle loop itself
+	print("{:.1f} ms of CPU per second of play, with the countdown redrawn {} times a second".format(1000 * cpu / seconds, round(1 / CursedSweeper.TRIAL_TIMER_TICK)))
+
+if __name__ == "__main__":
+	main(float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SECONDS)
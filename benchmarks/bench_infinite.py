@@ -0,0 +1,56 @@
+'''
+Benchmark for the infinite board: a player walks across the world, clicking and flagging around them,
+under a chunk budget. Reports the time per move, how many chunks are loaded and archived,
+and the peak traced memory, which should level off at the budget however far the walk goes.
+Run from the repository root:
+
+	python -m benchmarks.bench_infinite --steps 20000 --max-chunks 256
+'''
+
+import argparse
+import time
+import tracemalloc
+from random import Random
+
+from bin.ConsoleSweeperBones import CSDifficulty
+from bin.ConsoleSweeperInfinite import CSInfiniteBoard, WORLD_SIZE
+
+def walk(board: CSInfiniteBoard, steps: int, seed: int, report_every: int):
+	'''
+	Moves a point across the world one cell at a time, clicking or flagging a random cell near it every step.
+	'''
+	rng = Random(seed)
+	row = col = WORLD_SIZE // 2
+	board.click_tile(row, col)
+	start = time.perf_counter()
+	for step in range(1, steps + 1):
+		row += rng.choice((-1, 0, 1, 1))
+		col += rng.choice((-1, 0, 1, 1))
+		target_row = row + rng.randrange(-8, 9)
+		target_col = col + rng.randrange(-8, 9)
+		if rng.random() < 0.2:
+			board.toggle_flag(target_row, target_col)
+		elif not board.grid[target_row][target_col].is_flagged():
+			board.click_tile(target_row, target_col)
+
+		if step % report_every == 0:
+			loaded, archived, archive_bytes = board.memory_stats()
+			_, peak = tracemalloc.get_traced_memory()
+			print("{:>8} moves {:>9.1f} us/move {:>6} loaded {:>7} archived {:>10.1f} KiB archive {:>10.1f} KiB peak".format(
+				step, (time.perf_counter() - start) / step * 1e6, loaded, archived, archive_bytes / 1024, peak / 1024), flush = True)
+
+def main():
+	parser = argparse.ArgumentParser(description = "Benchmark the infinite board's chunk cache.")
+	parser.add_argument("--steps", type = int, default = 20000)
+	parser.add_argument("--max-chunks", type = int, default = 256)
+	parser.add_argument("--difficulty", default = "NORMAL", choices = [difficulty.name for difficulty in CSDifficulty])
+	parser.add_argument("--seed", type = int, default = 1)
+	args = parser.parse_args()
+
+	tracemalloc.start()
+	board = CSInfiniteBoard(CSDifficulty[args.difficulty].value, args.seed, args.max_chunks)
+	walk(board, args.steps, args.seed, max(args.steps // 10, 1))
+	tracemalloc.stop()
+
+if __name__ == "__main__":
+	main()
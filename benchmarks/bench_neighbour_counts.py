@@ -0,0 +1,52 @@
+'''
+Compares the per-cell neighbour count loop against the bulk shifted-sum count.
+Run from the repository root:
+
+	python -m benchmarks.bench_neighbour_counts [size ...]
+'''
+
+import sys
+import time
+
+from bin import ConsoleSweeperBones
+
+DEFAULT_SIZES = [50, 500, 2000]
+
+def count_per_cell(board):
+	'''
+	The original stage: one count_neighbours_deadly call for every cell.
+	'''
+	for i in range(board.rows):
+		for j in range(board.cols):
+			board.grid[i][j].num_mines_around = board.count_neighbours_deadly(i, j)
+
+def count_bulk(board):
+	'''
+	The bulk stage used by emplace_mines.
+	'''
+	for row, counts in zip(board.grid, board.count_neighbours_all()):
+		for tile, count in zip(row, counts):
+			tile.num_mines_around = count
+
+def time_stage(stage, board) -> float:
+	start = time.perf_counter()
+	stage(board)
+	return time.perf_counter() - start
+
+def main(sizes: [int]):
+	print("{:>6} {:>12} {:>12} {:>9}".format("size", "per-cell (s)", "bulk (s)", "speedup"))
+	for size in sizes:
+		num_mines = int(ConsoleSweeperBones.CSDifficulty.NORMAL.value * size * size)
+		board = ConsoleSweeperBones.CSBoard(size, size, num_mines)
+		board.emplace_mines([0, 0])
+
+		per_cell = time_stage(count_per_cell, board)
+		expected = [[tile.num_mines_around for tile in row] for row in board.grid]
+		bulk = time_stage(count_bulk, board)
+		if expected != [[tile.num_mines_around for tile in row] for row in board.grid]:
+			raise AssertionError("bulk neighbour counts disagree with the per-cell loop")
+
+		print("{:>6} {:>12.4f} {:>12.4f} {:>8.1f}x".format(size, per_cell, bulk, per_cell / bulk))
+
+if __name__ == "__main__":
+	main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
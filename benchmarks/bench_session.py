@@ -0,0 +1,75 @@
+'''
+Plays a long run of games through one CSSession and checks that memory stays flat,
+then times a new game on a reset board against one on a freshly built board.
+Run from the repository root:
+
+	python -m benchmarks.bench_session [games]
+'''
+
+import gc
+import sys
+import time
+import tracemalloc
+from random import Random
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSChoice, CSDifficulty, CSStatus
+from bin.ConsoleSweeperSession import CSSession
+
+DEFAULT_GAMES = 10000
+SIZE = 16
+RESET_SIZES = [50, 500, 1000]
+
+def play_random_game(board: ConsoleSweeperBones.CSBoard, rng: Random):
+	'''
+	Clicks random hidden cells until the game ends.
+	'''
+	status = CSStatus.PLAYING
+	while status == CSStatus.PLAYING:
+		row, col = rng.randrange(board.rows), rng.randrange(board.cols)
+		status = board.apply_actions([(CSChoice.CLICK, row, col)]).status
+
+def run_session(num_games: int):
+	session = CSSession()
+	rng = Random(0)
+	num_mines = int(CSDifficulty.NORMAL.value * SIZE * SIZE)
+	checkpoints = {num_games // 10, num_games // 2, num_games}
+
+	tracemalloc.start()
+	print("{:>8} {:>14} {:>14}".format("games", "traced bytes", "boards built"))
+	for game in range(1, num_games + 1):
+		play_random_game(session.new_board(SIZE, SIZE, num_mines, game), rng)
+		if game in checkpoints:
+			gc.collect()
+			print("{:>8} {:>14} {:>14}".format(game, tracemalloc.get_traced_memory()[0], session.boards_built))
+	tracemalloc.stop()
+	session.close()
+
+def time_reset(size: int) -> (float, float):
+	'''
+	Returns the seconds taken to get an empty size x size board for the next game, by building one and by resetting one.
+	'''
+	num_mines = int(CSDifficulty.NORMAL.value * size * size)
+	board = ConsoleSweeperBones.create_board(size, size, num_mines, "tiles", 0)
+	board.emplace_mines([0, 0])
+
+	start = time.perf_counter()
+	built = ConsoleSweeperBones.create_board(size, size, num_mines, "tiles", 1)
+	build_time = time.perf_counter() - start
+	del built
+
+	start = time.perf_counter()
+	board.reset(num_mines, 1)
+	reset_time = time.perf_counter() - start
+	return (build_time, reset_time)
+
+def main(num_games: int):
+	run_session(num_games)
+	print()
+	print("{:>6} {:>12} {:>12}".format("size", "build (s)", "reset (s)"))
+	for size in RESET_SIZES:
+		build_time, reset_time = time_reset(size)
+		print("{:>6} {:>12.4f} {:>12.4f}".format(size, build_time, reset_time))
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_GAMES)
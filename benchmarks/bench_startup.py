@@ -0,0 +1,66 @@
+'''
+Measures how long a fresh interpreter takes to import the engine, the way short-lived batch tools do,
+and checks that the import does not read the settings file or start a game.
+Run from the repository root:
+
+	python -m benchmarks.bench_startup [runs]
+'''
+
+import subprocess
+import sys
+import time
+
+DEFAULT_RUNS = 20
+
+# each target is a statement run in a fresh interpreter; the first is the baseline every other one is measured against
+TARGETS = [
+	("python only", "pass"),
+	("import bin", "import bin"),
+	("board engine", "from bin import ConsoleSweeperBones"),
+	("solver", "from bin import ConsoleSweeperSolver"),
+	("simulator", "from bin import ConsoleSweeperSim"),
+	("no-curses frontend", "import ConsoleSweeperNoCurses"),
+	("curses frontend", "import CursedSweeper"),
+]
+
+# run after each target: importing must leave the settings unread
+SIDE_EFFECT_CHECK = "\nimport sys\nsettings = sys.modules.get('bin.ConsoleSweeperSettings')\nassert settings is None or settings.loaded_settings is None, 'settings were read on import'"
+
+def time_target(statement: str, runs: int) -> float:
+	'''
+	Returns the fastest wall-clock time, in seconds, of running statement in a new interpreter.
+	The fastest run is the one least disturbed by the rest of the machine.
+	'''
+	best = None
+	for i in range(runs):
+		start = time.perf_counter()
+		subprocess.run([sys.executable, "-c", statement + SIDE_EFFECT_CHECK], check = True, stdin = subprocess.DEVNULL)
+		elapsed = time.perf_counter() - start
+		if best is None or elapsed < best:
+			best = elapsed
+	return best
+
+def main(runs: int) -> int:
+	'''
+	Times every target. Returns 1 if any of them failed, e.g. because its import read the settings, so CI can catch it.
+	'''
+	print("{:>20} {:>12} {:>12}".format("target", "total (ms)", "import (ms)"))
+	baseline = None
+	failed = 0
+	for name, statement in TARGETS:
+		try:
+			elapsed = time_target(statement, runs)
+		except subprocess.CalledProcessError:
+			print("{:>20} {:>12}".format(name, "failed"))
+			failed += 1
+			continue
+		if baseline is None:
+			baseline = elapsed
+		print("{:>20} {:>12.1f} {:>12.1f}".format(name, elapsed * 1000, (elapsed - baseline) * 1000))
+	if failed:
+		print("{} of {} targets failed".format(failed, len(TARGETS)))
+		return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS))
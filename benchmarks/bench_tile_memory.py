@@ -0,0 +1,60 @@
+'''
+Measures memory per cell and construction time for each board layout:
+the original CSTile with an instance __dict__, the __slots__ CSTile, and the NumPy array engine.
+Run from the repository root:
+
+	python -m benchmarks.bench_tile_memory [size ...]
+'''
+
+import sys
+import time
+import tracemalloc
+
+from bin import ConsoleSweeperBones
+
+DEFAULT_SIZES = [50, 500, 2000]
+
+class CSDictTile(ConsoleSweeperBones.CSTile):
+	'''
+	A CSTile with an instance __dict__, i.e. the layout before CSTile had __slots__.
+	'''
+
+class CSDictBoard(ConsoleSweeperBones.CSBoard):
+	def make_board(self):
+		self.grid = [[CSDictTile() for j in range(self.cols)] for i in range(self.rows)]
+
+def layouts():
+	found = [("dict tiles", CSDictBoard), ("slots tiles", ConsoleSweeperBones.CSBoard)]
+	try:
+		from bin.ConsoleSweeperArrays import CSArrayBoard
+		found.append(("numpy arrays", CSArrayBoard))
+	except ImportError:
+		pass
+	return found
+
+def measure(board_class, size: int) -> (float, float):
+	'''
+	Returns the bytes allocated per cell and the seconds taken to construct one size x size board.
+	Time is measured without tracemalloc running, since tracing slows allocation down.
+	'''
+	start = time.perf_counter()
+	board = board_class(size, size, 0)
+	elapsed = time.perf_counter() - start
+	del board
+
+	tracemalloc.start()
+	board = board_class(size, size, 0)
+	allocated, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del board
+	return (allocated / (size * size), elapsed)
+
+def main(sizes: [int]):
+	print("{:>6} {:>14} {:>12} {:>12}".format("size", "layout", "bytes/cell", "build (s)"))
+	for size in sizes:
+		for name, board_class in layouts():
+			per_cell, elapsed = measure(board_class, size)
+			print("{:>6} {:>14} {:>12.1f} {:>12.4f}".format(size, name, per_cell, elapsed))
+
+if __name__ == "__main__":
+	main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
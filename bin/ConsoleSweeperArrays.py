@@ -0,0 +1,267 @@
+'''
+This file defines an array-backed board engine for the Minesweeper game.
+The board state lives in contiguous NumPy arrays instead of a 2-D list of CSTiles,
+which keeps board setup and the win check cheap on very large boards.
+'''
+
+import numpy as np
+
+from bin.ConsoleSweeperBones import CSBoard, CSTile
+
+class CSArrayBoard(CSBoard):
+	'''
+	This class encodes the board state of the ConsoleSweeper game using NumPy arrays.
+	It exposes the same public API as CSBoard, including a grid of tile views.
+	'''
+	def make_board(self):
+		'''
+		Allocates the mine, clicked, flagged and neighbour-count arrays that represent the board.
+		'''
+		shape = (self.rows, self.cols)
+		self.mine_map = np.zeros(shape, dtype = bool)
+		self.clicked_map = np.zeros(shape, dtype = bool)
+		self.flag_map = np.zeros(shape, dtype = bool)
+		self.count_map = np.zeros(shape, dtype = np.uint8)
+		self.grid = CSArrayGrid(self)
+
+	def clear_board(self):
+		for cell_map in (self.mine_map, self.clicked_map, self.flag_map, self.count_map):
+			cell_map.fill(0)
+
+	def plant_layout(self, cells: [int]):
+		'''
+		Plants mines on the given flat cell indices (row * cols + col).
+		'''
+		self.mine_map.reshape(-1)[cells] = True
+
+		# update the mine counts of the board's occupants
+		self.count_map = self.count_neighbours_all()
+
+	def move_mine(self, from_cell: int, to_cell: int):
+		'''
+		Moves one mine, updating only the mine counts around its old and new cells.
+		'''
+		row_int, col_int = divmod(from_cell, self.cols)
+		self.mine_map[row_int, col_int] = False
+		self.count_map[max(row_int - 1, 0):row_int + 2, max(col_int - 1, 0):col_int + 2] -= 1
+		row_int, col_int = divmod(to_cell, self.cols)
+		self.mine_map[row_int, col_int] = True
+		self.count_map[max(row_int - 1, 0):row_int + 2, max(col_int - 1, 0):col_int + 2] += 1
+
+	def count_neighbours_all(self):
+		'''
+		Counts the number of mines adjacent to every cell at once with a padded shifted sum.
+		'''
+		padded = np.zeros((self.rows + 2, self.cols + 2), dtype = np.uint8)
+		padded[1:-1, 1:-1] = self.mine_map
+		counts = np.zeros((self.rows, self.cols), dtype = np.uint8)
+		for x in (0, 1, 2):
+			for y in (0, 1, 2):
+				counts += padded[x:x + self.rows, y:y + self.cols]
+		return counts
+
+	def in_bounds(self, row: int, col: int) -> bool:
+		'''
+		Given a pair of integers, determine if the corresponding coordinates exist on the board.
+		'''
+		return 0 <= row < self.rows and 0 <= col < self.cols
+
+	def count_neighbours_deadly(self, grid_row: int, grid_col: int) -> int:
+		'''
+		Counts the number of mines adjacent to this cell.
+		'''
+		return int(np.count_nonzero(self.mine_map[max(grid_row - 1, 0):grid_row + 2, max(grid_col - 1, 0):grid_col + 2]))
+
+	def grid_row_to_string(self, row: int, game_over: bool, mine_row: int, mine_col: int, first_col: int = 0, end_col: int = None):
+		this_row = self.grid[row]
+		cols = range(first_col, self.cols if end_col is None else end_col)
+		if game_over:
+			return "".join(this_row[col].to_string_game_over(row == mine_row and col == mine_col) for col in cols)
+		return "".join(this_row[col].to_string() for col in cols)
+
+	def reveal_region(self, row_int: int, col_int: int) -> [(int, int)]:
+		'''
+		Does the work of reveal_tile with an explicit stack of row runs,
+		and returns the coordinates of every tile it revealed.
+		'''
+		if self.clicked_map[row_int, col_int]:
+			return []
+
+		self.clicked_map[row_int, col_int] = True
+		revealed = [(row_int, col_int)]
+		if self.mine_map[row_int, col_int]:
+			self.num_clicked_cells += 1
+			return revealed
+
+		flags_cleared = 1 if self.flag_map[row_int, col_int] else 0
+		self.flag_map[row_int, col_int] = False
+		if self.count_map[row_int, col_int] != 0:
+			self.num_clicked_cells += 1
+			self.flags_placed -= flags_cleared
+			self.flags_left += flags_cleared
+			return revealed
+
+		# flood over rows copied out as lists, which index much faster than the arrays themselves.
+		# only the rows the opening reaches are copied, so a small opening costs little however big the board is
+		cols = self.cols
+		clicked_map = self.clicked_map
+		count_map = self.count_map
+		clicked_rows = {}
+		count_rows = {}
+		to_visit = [(row_int, col_int)]
+		while to_visit:
+			row, col = to_visit.pop()
+			clicked = clicked_rows.get(row)
+			if clicked is None:
+				clicked = clicked_rows[row] = clicked_map[row].tolist()
+				count_rows[row] = count_map[row].tolist()
+			counts = count_rows[row]
+
+			# grow a run of zero tiles to the left and right of this one
+			left = col
+			while left > 0 and not clicked[left - 1] and counts[left - 1] == 0:
+				left -= 1
+			right = col
+			while right < cols - 1 and not clicked[right + 1] and counts[right + 1] == 0:
+				right += 1
+			left = max(left - 1, 0)
+			right = min(right + 1, cols - 1)
+			for y_nbr in range(left, right + 1):
+				if not clicked[y_nbr]:
+					clicked[y_nbr] = True
+					revealed.append((row, y_nbr))
+
+			# every tile above and below the run borders it, so reveal those too.
+			# only the first tile of each new run of zeros becomes a seed; it reveals the rest itself.
+			for x_nbr in (row - 1, row + 1):
+				if x_nbr < 0 or x_nbr >= self.rows:
+					continue
+				nbr_clicked = clicked_rows.get(x_nbr)
+				if nbr_clicked is None:
+					nbr_clicked = clicked_rows[x_nbr] = clicked_map[x_nbr].tolist()
+					count_rows[x_nbr] = count_map[x_nbr].tolist()
+				nbr_counts = count_rows[x_nbr]
+				in_zero_run = False
+				for y_nbr in range(left, right + 1):
+					if nbr_clicked[y_nbr]:
+						in_zero_run = False
+					elif nbr_counts[y_nbr] != 0:
+						nbr_clicked[y_nbr] = True
+						revealed.append((x_nbr, y_nbr))
+						in_zero_run = False
+					elif not in_zero_run:
+						nbr_clicked[y_nbr] = True
+						revealed.append((x_nbr, y_nbr))
+						to_visit.append((x_nbr, y_nbr))
+						in_zero_run = True
+
+		# write the rows the opening reached back into the same arrays; revealed tiles hand their flags back
+		flag_map = self.flag_map
+		for row, clicked in clicked_rows.items():
+			opened = np.array(clicked, dtype = bool)
+			opened &= ~clicked_map[row]
+			flag_row = flag_map[row]
+			flags_cleared += int(np.count_nonzero(flag_row & opened))
+			flag_row &= ~opened
+			clicked_map[row] |= opened
+		self.num_clicked_cells += len(revealed)
+		self.flags_placed -= flags_cleared
+		self.flags_left += flags_cleared
+		return revealed
+
+	def count_cells(self) -> (int, int, int):
+		'''
+		Rescans the whole board for the number of clicked cells, flags placed and correctly flagged mines.
+		'''
+		return (int(np.count_nonzero(self.clicked_map)), int(np.count_nonzero(self.flag_map)), int(np.count_nonzero(self.mine_map & self.flag_map)))
+
+	def cell_maps(self) -> (bytes, bytes, bytes):
+		return (self.mine_map.tobytes(), self.clicked_map.tobytes(), self.flag_map.tobytes())
+
+	def restore_cell_maps(self, mines: bytes, clicked: bytes, flagged: bytes):
+		# copied into the board's own arrays, so anything holding on to them sees the restored state
+		shape = (self.rows, self.cols)
+		self.mine_map[...] = np.frombuffer(mines, dtype = bool).reshape(shape)
+		self.clicked_map[...] = np.frombuffer(clicked, dtype = bool).reshape(shape)
+		self.flag_map[...] = np.frombuffer(flagged, dtype = bool).reshape(shape)
+		self.count_map[...] = self.count_neighbours_all()
+
+
+class CSArrayGrid():
+	'''
+	A read-only 2-D view over a CSArrayBoard that mimics the list-of-lists grid of CSBoard.
+	'''
+	def __init__(self, board: CSArrayBoard):
+		self.board = board
+
+	def __len__(self) -> int:
+		return self.board.rows
+
+	def __getitem__(self, row: int):
+		if row < 0:
+			row += self.board.rows
+		if not 0 <= row < self.board.rows:
+			raise IndexError("board row out of range")
+		return CSArrayRow(self.board, row)
+
+	def __iter__(self):
+		for row in range(self.board.rows):
+			yield CSArrayRow(self.board, row)
+
+
+class CSArrayRow():
+	'''
+	A single row of tile views over a CSArrayBoard.
+	'''
+	def __init__(self, board: CSArrayBoard, row: int):
+		self.board = board
+		self.row = row
+
+	def __len__(self) -> int:
+		return self.board.cols
+
+	def __getitem__(self, col: int):
+		if col < 0:
+			col += self.board.cols
+		if not 0 <= col < self.board.cols:
+			raise IndexError("board column out of range")
+		return CSArrayTile(self.board, self.row, col)
+
+	def __iter__(self):
+		for col in range(self.board.cols):
+			yield CSArrayTile(self.board, self.row, col)
+
+
+class CSArrayTile(CSTile):
+	'''
+	A thin view of one cell of a CSArrayBoard, so that existing CSTile call sites keep working.
+	'''
+	__slots__ = ('board', 'row', 'col')
+
+	def __init__(self, board: CSArrayBoard, row: int, col: int):
+		self.board = board
+		self.row = row
+		self.col = col
+
+	def click(self):
+		self.board.clicked_map[self.row, self.col] = True
+	def is_clicked(self) -> bool:
+		return bool(self.board.clicked_map[self.row, self.col])
+
+	def plant_flag(self, is_flag: bool):
+		self.board.flag_map[self.row, self.col] = is_flag
+	def is_flagged(self) -> bool:
+		return bool(self.board.flag_map[self.row, self.col])
+
+	def plant_mine(self, mine: bool):
+		self.board.mine_map[self.row, self.col] = mine
+	def is_mine(self) -> bool:
+		return bool(self.board.mine_map[self.row, self.col])
+
+	@property
+	def num_mines_around(self) -> int:
+		return int(self.board.count_map[self.row, self.col])
+
+	@num_mines_around.setter
+	def num_mines_around(self, count: int):
+		self.board.count_map[self.row, self.col] = count
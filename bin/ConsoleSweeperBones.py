@@ -2,61 +2,178 @@
 This file defines the objects and internal logic for the Minesweeper game.
 '''
 
-import time
-import string
-from random import *
+from itertools import compress
+from operator import attrgetter
+from random import Random, getrandbits
 from enum import Enum
-from array import *
 
 class CSBoard():
 	'''
 	This class encodes the board state of the ConsoleSweeper game.
 	'''
-	def __init__(self, grid_rows: int, grid_cols: int, num_mines: int):
-		self.clicks_so_far = 0 #really, the number of "actions" so far
+	# when set, every win check also rescans the board to verify the running counters
+	debug = False
+	# an unbounded world cannot be saved, scored or replayed, and has no count of flags left worth showing
+	infinite = False
+
+	def __init__(self, grid_rows: int, grid_cols: int, num_mines: int, seed: int = None):
 		self.rows = grid_rows
 		self.cols = grid_cols
+		self.layout_thread = None
+		self.make_board()
+		self.start_game(num_mines, seed)
+
+	def start_game(self, num_mines: int, seed: int = None):
+		'''
+		Sets the seed and the counters up for a new game on an empty board.
+		'''
+		if num_mines > self.cols * self.rows:
+			raise Exception("The quantity of mines cannot exceed the size of the board.")
+
+		self.clicks_so_far = 0 #really, the number of "actions" so far
+		# the seed alone decides the mine layout for a given first click, so games can be replayed
+		self.seed = seed if seed is not None else getrandbits(64)
+		self.rng = Random(self.seed)
+		self.action_log = None
 		self.mines = num_mines
-		self.flags_left = num_mines + (grid_rows + grid_cols) // 4
+		self.flags_left = num_mines + (self.rows + self.cols) // 4
 		self.flags_placed = 0
 		self.num_clicked_cells = 0
-		self.make_board()
+		self.mines_flagged = 0
+		# the layout can be prepared before the first click, but the mines only settle on it
+		self.layout_ready = False
+		self.spare_cells = None
+		self.layout_thread = None
+		self.mines_placed = False
+		self.flags_before_mines = set()
 
-		if num_mines > grid_cols * grid_rows:
-			raise Exception("The quantity of mines cannot exceed the size of the board.")
+	def reset(self, num_mines: int = None, seed: int = None):
+		'''
+		Clears the board in place for a new game of the same size, with num_mines mines (by default as many as before).
+		The grid is kept and emptied rather than built again, so back-to-back games reuse the same storage.
+		'''
+		# a layout still being prepared for the last game must not land on the new one
+		if self.layout_thread is not None:
+			self.layout_thread.join()
+		self.clear_board()
+		self.start_game(self.mines if num_mines is None else num_mines, seed)
 
 	def make_board(self):
 		'''
 		Constructs a 2-D List of CSTiles that represents the board.
 		'''
 		#initialization of board elements
-		self.grid = []
-		for i in range(self.rows):
-			col = []
-			for j in range(self.cols):
-				col.append(CSTile())
-			self.grid.append(col)
+		self.grid = [[CSTile() for j in range(self.cols)] for i in range(self.rows)]
 	
-	def emplace_mines(self, forbidden: [int]):
+	def clear_board(self):
 		'''
-		populates the board with mines.
+		Takes every mine, click, flag and count off the grid, leaving it as make_board built it.
 		'''
-		minecount = self.mines
-		while minecount > 0:
-			rowInt = randint(0, self.rows - 1)
-			colInt = randint(0, self.cols - 1)
-			while (self.grid[rowInt][colInt].is_mine() or (rowInt == forbidden[0] and colInt == forbidden[1])):
-				rowInt = randint(0, self.rows - 1)
-				colInt = randint(0, self.cols - 1) 
+		for row in self.grid:
+			for tile in row:
+				tile.contains_mine = False
+				tile.been_clicked = False
+				tile.flagged = False
+				tile.num_mines_around = 0
+	
+	def emplace_mines(self, forbidden: [int], safe_radius: int = 1):
+		'''
+		populates the board with mines, keeping them out of the cells within safe_radius of the forbidden cell.
+		The layout is prepared first unless that already happened ahead of time;
+		then only the few mines next to the forbidden cell have to move.
+		'''
+		if self.layout_thread is not None:
+			self.layout_thread.join()
+			self.layout_thread = None
+		self.prepare_layout()
+
+		# move each mine in the safe region to a random free cell outside it
+		region = self.safe_region(forbidden, safe_radius)
+		in_region = set(region)
+		moving = [cell for cell in region if self.grid[cell // self.cols][cell % self.cols].is_mine()]
+		targets = [cell for cell in self.spare_cells if cell not in in_region]
+		if len(targets) < len(moving):
+			# only a safe_radius wider than the spare cells were drawn for gets here
+			mines = self.cell_maps()[0]
+			targets = self.rng.sample([cell for cell in range(self.rows * self.cols) if not mines[cell] and cell not in in_region], len(moving))
+		for cell, target in zip(moving, targets):
+			self.move_mine(cell, target)
+		self.spare_cells = None
 
-			self.grid[rowInt][colInt].plant_mine(True)
-			minecount -= 1
+		# flags can go down before the first click, so a mine may lie under one
+		self.mines_placed = True
+		self.mines_flagged = sum(self.grid[cell // self.cols][cell % self.cols].is_mine() for cell in self.flags_before_mines)
+		self.flags_before_mines = None
+
+	def prepare_layout(self):
+		'''
+		Places every mine and writes every neighbour count before the first click is known.
+		This is the slow part of setting up a big board, so it can run ahead of time.
+		'''
+		if self.layout_ready:
+			return
+		shuffle = CSCellShuffle(self.rng, self.rows * self.cols)
+		self.plant_layout(shuffle.draw_many(int(self.mines)))
+		# the shuffle carries on past the mines, so its next cells are free ones in random order, for emplace_mines to move mines to.
+		# a first click's region can need as many as it has cells; only those are kept, and the shuffle is let go here, off the first click
+		self.spare_cells = shuffle.draw_many(min(LAYOUT_SPARE_CELLS, shuffle.num_cells - shuffle.drawn))
+		self.layout_ready = True
+
+	def prepare_layout_in_background(self):
+		'''
+		Starts prepare_layout on a worker thread, so the layout is ready by the time the first click comes in.
+		emplace_mines waits for the thread if it has not finished yet.
+		'''
+		# only games that are played interactively get here, so tools that just import the engine never load threading
+		import threading
+		self.layout_thread = threading.Thread(target = self.prepare_layout, daemon = True)
+		self.layout_thread.start()
+
+	def plant_layout(self, cells: [int]):
+		'''
+		Plants mines on the given flat cell indices (row * cols + col).
+		'''
+		for cell in cells:
+			row_int, col_int = divmod(cell, self.cols)
+			self.grid[row_int][col_int].plant_mine(True)
 
 		# update the mine counts of the board's occupants
-		for i in range(self.rows):
-			for j in range(self.cols):
-				this_tile = self.grid[i][j]
-				this_tile.num_mines_around = self.count_neighbours_deadly(i, j)
+		for row, counts in zip(self.grid, self.count_neighbours_all()):
+			for tile, count in zip(row, counts):
+				tile.num_mines_around = count
+
+	def move_mine(self, from_cell: int, to_cell: int):
+		'''
+		Moves one mine, updating only the mine counts around its old and new cells.
+		'''
+		for cell, change in ((from_cell, -1), (to_cell, 1)):
+			row_int, col_int = divmod(cell, self.cols)
+			self.grid[row_int][col_int].plant_mine(change > 0)
+			for x_nbr in range(max(row_int - 1, 0), min(row_int + 2, self.rows)):
+				for y_nbr in range(max(col_int - 1, 0), min(col_int + 2, self.cols)):
+					self.grid[x_nbr][y_nbr].num_mines_around += change
+
+	def safe_region(self, forbidden: [int], safe_radius: int = 1) -> [int]:
+		'''
+		Lists the flat indices of the cells that must stay clear of mines: those within safe_radius of the forbidden cell,
+		or only the forbidden cell itself if the board is too crowded to keep that whole region clear.
+		'''
+		region = self.forbidden_region(forbidden, safe_radius)
+		if self.mines > self.rows * self.cols - len(region):
+			region = [forbidden[0] * self.cols + forbidden[1]]
+		if self.mines > self.rows * self.cols - len(region):
+			raise Exception("The quantity of mines cannot exceed the number of free cells.")
+		return region
+
+	def forbidden_region(self, forbidden: [int], safe_radius: int) -> [int]:
+		'''
+		Lists the flat indices of the cells within safe_radius of the forbidden cell.
+		'''
+		region = []
+		for row_int in range(max(forbidden[0] - safe_radius, 0), min(forbidden[0] + safe_radius + 1, self.rows)):
+			for col_int in range(max(forbidden[1] - safe_radius, 0), min(forbidden[1] + safe_radius + 1, self.cols)):
+				region.append(row_int * self.cols + col_int)
+		return region
 
 	def in_bounds(self, row: int, col: int) -> bool:
 		'''
@@ -81,10 +198,33 @@ class CSBoard():
 					neighbours += 1
 		return neighbours
 
-	def grid_row_to_string(self, row: int, game_over: bool, mine_row: int, mine_col: int):
+	def count_neighbours_all(self) -> [[int]]:
+		'''
+		Counts the number of mines adjacent to every cell in one pass,
+		using a zero-padded shifted sum over the mine layout.
+		'''
+		pad_row = [0] * (self.cols + 2)
+		padded = [pad_row]
+		for row in self.grid:
+			padded.append([0] + [1 if tile.contains_mine else 0 for tile in row] + [0])
+		padded.append(pad_row)
+
+		# sum each cell with its left and right neighbours...
+		row_sums = [[a + b + c for a, b, c in zip(row, row[1:], row[2:])] for row in padded]
+
+		# ...then sum those with the rows above and below
+		return [[a + b + c for a, b, c in zip(above, here, below)] for above, here, below in zip(row_sums, row_sums[1:], row_sums[2:])]
+
+	def grid_row_to_string(self, row: int, game_over: bool, mine_row: int, mine_col: int, first_col: int = 0, end_col: int = None):
+		'''
+		Renders the row's tiles from first_col up to, but not including, end_col; by default the whole row.
+		'''
 		this_row = self.grid[row]
+		if end_col is None:
+			end_col = self.cols
 		row_string = ""
-		for col, tile in enumerate(this_row):
+		for col in range(first_col, end_col):
+			tile = this_row[col]
 			if game_over:
 				was_cause = False
 				if row == mine_row and col == mine_col:
@@ -94,120 +234,303 @@ class CSBoard():
 				row_string += tile.to_string()
 		return row_string
 
+	def grid_console_text(self, game_over: bool = False, loss_row: int = -1, loss_col: int = -1) -> str:
+		'''
+		Builds the console picture of the board, with row and column numbers, as one string.
+		With game_over set it shows the true board state, marking the mine at (loss_row, loss_col) as the one that went off.
+		'''
+		header = "(*-*) YOU LOST\n" if game_over else "(^-^)7 \n\n"
+		col_labels = "".join((" " + str(y)) if y >= 10 else (" " + str(y) + " ") for y in range(1, self.cols + 1))
+		lines = [header + "  " + col_labels]
+		for row in range(self.rows):
+			row_label = str(row + 1) if row + 1 >= 10 else str(row + 1) + " "
+			lines.append(row_label + self.grid_row_to_string(row, game_over, loss_row, loss_col))
+		return "\n".join(lines) + "\n\n"
+
 	def print_grid_console(self):
 		'''
-		Produces formatted console output representing the board state.
-		'''
-		# TODO implement this lmao
-		x = 1
-		y = 1
-		print("(^-^)7 \n")
-		print("  ", end = "")
-		#print column labels
-		for col_elem in self.grid[0]:
-			if (y >= 10):
-				print(" " + str(y), end = "")
-				y += 1
-			elif (y < 10):
-				print(" "+ str(y) +" ", end = "")
-				y += 1
-		print('')
-		
-		#print row labels
-		for r in range(len(self.grid)):
-			row_elem = self.grid[r]
-			if (x < 10):
-				print(str(x) + " ", end = "")
-			else:
-				print(str(x), end = "")
-			
-			#print cells
-			for c in range(len(row_elem)):
-				cell = row_elem[c]
-				print(cell.to_string(), end = '')
-			print('')
-			x += 1
-		print('')
-	
+		Produces formatted console output representing the board state, in a single write.
+		'''
+		print(self.grid_console_text(), end = "")
 	
 	def print_grid_console_true(self, loss_row: int, loss_col: int):
 		'''
-		Produces formatted console output representing the true board state.
+		Produces formatted console output representing the true board state, in a single write.
 		'''
-		x = 1
-		y = 1
-		print("(*-*) YOU LOST")
-		print("  ", end = "")
-		
-		#print column labels
-		for col_elem in self.grid[0]:
-			if (y >= 10):
-				print(" " + str(y), end = "")
-				y += 1
-			elif (y < 10):
-				print(" " + str(y) + " ", end = "")
-				y += 1
-		print('')
-		
-		#print row labels
-		for r in range(len(self.grid)):
-			row_elem = self.grid[r]
-			if (x < 10):
-				print(str(x) + " ", end = "")
-			else:
-				print(str(x), end = "")
-			
-			#print cells
-			for c in range(len(row_elem)):
-				cell = row_elem[c]
-				was_cause = (r == loss_row and c == loss_col)
-				print(cell.to_string_game_over(was_cause), end = "")
-			print('')
-			x += 1
-		print('')
+		print(self.grid_console_text(True, loss_row, loss_col), end = "")
 	
+	def click_tile(self, row_int: int, col_int: int) -> [(int, int)]:
+		'''
+		Plays one click the way the frontends do: mines are placed after the first click,
+		then the tile is revealed. Returns the coordinates of every tile it revealed.
+		'''
+		if self.action_log is not None:
+			self.action_log.record(CSChoice.CLICK, row_int, col_int)
+
+		# populate board with mines at random locations,
+		# but only after the first click.
+		if self.clicks_so_far == 0:
+			self.emplace_mines([row_int, col_int])
+
+		revealed = self.reveal_region(row_int, col_int)
+		self.clicks_so_far += 1
+		return revealed
+
 	def reveal_tile(self, row_int: int, col_int: int) -> bool:
 		'''
-		Recursively "clicks" all tiles in a given cell's reveal group,
+		"Clicks" all tiles in a given cell's reveal group,
 		i.e. all tiles reachable from this one with no surrounding mines
 		up to the first tiles encountered with some number of surrounding mines.
+		Returns False if the clicked tile was a mine.
 		'''
-		this_tile = self.grid[row_int][col_int]
-		if(this_tile.is_clicked()):
+		if self.grid[row_int][col_int].is_clicked():
 			return True
 
-		this_tile.click()
-		self.num_clicked_cells += 1
+		self.reveal_region(row_int, col_int)
+		return not self.grid[row_int][col_int].is_mine()
+
+	def reveal_region(self, row_int: int, col_int: int) -> [(int, int)]:
+		'''
+		Does the work of reveal_tile with an explicit stack of row runs instead of recursion,
+		so openings of any size are safe, and returns the coordinates of every tile it revealed.
+		'''
+		this_tile = self.grid[row_int][col_int]
+		if this_tile.is_clicked():
+			return []
 
+		this_tile.click()
+		revealed = [(row_int, col_int)]
 		if this_tile.is_mine():
+			self.num_clicked_cells += 1
+			return revealed
+
+		flags_cleared = 1 if this_tile.is_flagged() else 0
+		this_tile.plant_flag(False)
+		to_visit = [(row_int, col_int)] if this_tile.num_mines_around == 0 else []
+		while to_visit:
+			row, col = to_visit.pop()
+			grid_row = self.grid[row]
+
+			# grow a run of zero tiles to the left and right of this one
+			left = col
+			while left > 0 and not grid_row[left - 1].been_clicked and grid_row[left - 1].num_mines_around == 0:
+				left -= 1
+			right = col
+			while right < self.cols - 1 and not grid_row[right + 1].been_clicked and grid_row[right + 1].num_mines_around == 0:
+				right += 1
+			left = max(left - 1, 0)
+			right = min(right + 1, self.cols - 1)
+			for y_nbr in range(left, right + 1):
+				tile = grid_row[y_nbr]
+				if not tile.been_clicked:
+					tile.been_clicked = True
+					if tile.flagged:
+						tile.flagged = False
+						flags_cleared += 1
+					revealed.append((row, y_nbr))
+
+			# every tile above and below the run borders it, so reveal those too.
+			# only the first tile of each new run of zeros becomes a seed; it reveals the rest itself.
+			for x_nbr in (row - 1, row + 1):
+				if x_nbr < 0 or x_nbr >= self.rows:
+					continue
+				nbr_row = self.grid[x_nbr]
+				in_zero_run = False
+				for y_nbr in range(left, right + 1):
+					tile = nbr_row[y_nbr]
+					if tile.been_clicked:
+						in_zero_run = False
+					elif tile.num_mines_around != 0:
+						tile.been_clicked = True
+						if tile.flagged:
+							tile.flagged = False
+							flags_cleared += 1
+						revealed.append((x_nbr, y_nbr))
+						in_zero_run = False
+					elif not in_zero_run:
+						tile.been_clicked = True
+						if tile.flagged:
+							tile.flagged = False
+							flags_cleared += 1
+						revealed.append((x_nbr, y_nbr))
+						to_visit.append((x_nbr, y_nbr))
+						in_zero_run = True
+
+		# revealed tiles hand their flags back
+		self.num_clicked_cells += len(revealed)
+		self.flags_placed -= flags_cleared
+		self.flags_left += flags_cleared
+		return revealed
+
+	def set_flag(self, row_int: int, col_int: int, is_flag: bool):
+		'''
+		Plants or removes a flag, keeping the flag counters up to date.
+		'''
+		this_tile = self.grid[row_int][col_int]
+		if this_tile.is_flagged() == is_flag:
+			return
+
+		this_tile.plant_flag(is_flag)
+		change = 1 if is_flag else -1
+		self.flags_placed += change
+		self.flags_left -= change
+		if not self.mines_placed:
+			# the mines have not settled yet; emplace_mines counts these flags once they have
+			if is_flag:
+				self.flags_before_mines.add(row_int * self.cols + col_int)
+			else:
+				self.flags_before_mines.discard(row_int * self.cols + col_int)
+		elif this_tile.is_mine():
+			self.mines_flagged += change
+
+	def toggle_flag(self, row_int: int, col_int: int) -> bool:
+		'''
+		Toggles the flag on an unclicked tile. Flags can always be removed,
+		but only planted while there are flags left. Returns whether anything changed.
+		'''
+		this_tile = self.grid[row_int][col_int]
+		if this_tile.is_clicked():
 			return False
-		else:
-			this_tile.plant_flag(False)
-			deadlyneighbors = self.grid[row_int][col_int].num_mines_around
-			if(deadlyneighbors == 0):
-				for x in [-1, 0, 1]:
-					for y in [-1, 0, 1]:
-						x_nbr = row_int + x
-						y_nbr = col_int + y
-						if self.in_bounds(x_nbr, y_nbr) and not self.grid[x_nbr][y_nbr].is_clicked():
-							self.reveal_tile(x_nbr, y_nbr)
+		if not this_tile.is_flagged() and self.flags_left <= 0:
+			return False
+
+		if self.action_log is not None:
+			self.action_log.record(CSChoice.FLAG, row_int, col_int)
+		self.set_flag(row_int, col_int, not this_tile.is_flagged())
 		return True
 	
+	def chord_tile(self, row_int: int, col_int: int) -> [(int, int)]:
+		'''
+		Clicks every unflagged neighbour of a revealed number that has as many flags around it as its number.
+		This counts as one click, and goes to the replay log as one chord.
+		Returns the coordinates of every tile it revealed; if a flag was wrong, a mine is among them.
+		'''
+		this_tile = self.grid[row_int][col_int]
+		if not this_tile.is_clicked() or this_tile.is_mine() or this_tile.num_mines_around == 0:
+			return []
+
+		neighbours = [(x_nbr, y_nbr) for x_nbr in range(row_int - 1, row_int + 2) for y_nbr in range(col_int - 1, col_int + 2)
+			if (x_nbr, y_nbr) != (row_int, col_int) and self.in_bounds(x_nbr, y_nbr)]
+		if sum(self.grid[x_nbr][y_nbr].is_flagged() for x_nbr, y_nbr in neighbours) != this_tile.num_mines_around:
+			return []
+
+		revealed = []
+		for x_nbr, y_nbr in neighbours:
+			tile = self.grid[x_nbr][y_nbr]
+			if tile.is_clicked() or tile.is_flagged():
+				continue
+			revealed += self.reveal_region(x_nbr, y_nbr)
+		if revealed:
+			if self.action_log is not None:
+				self.action_log.record(CSChoice.CHORD, row_int, col_int)
+			self.clicks_so_far += 1
+		return revealed
+
+	def apply_actions(self, actions: [tuple]):
+		'''
+		Plays a sequence of (CSChoice, row, col) actions: CLICK, FLAG (which toggles) and CHORD.
+		Actions that would change nothing, such as clicking a flagged or revealed tile, are skipped.
+		Play stops at the first action that wins or loses the game; the rest are left unplayed.
+		Returns a CSActionResult with the cells that changed and how the game stands.
+		'''
+		result = CSActionResult()
+		revealed = result.revealed
+		flagged = result.flagged
+		grid = self.grid
+		toggle_flag = self.toggle_flag
+		click_tile = self.click_tile
+		FLAG, CLICK, CHORD = CSChoice.FLAG, CSChoice.CLICK, CSChoice.CHORD
+		# the win check is the one in check_win_cond, on counters that only these calls change
+		num_safe_cells = self.rows * self.cols - self.mines
+		debug = self.debug
+
+		for action, row_int, col_int in actions:
+			if action is FLAG:
+				if not toggle_flag(row_int, col_int):
+					continue
+				flagged.append((row_int, col_int))
+			elif action is CLICK:
+				tile = grid[row_int][col_int]
+				if tile.is_clicked() or tile.is_flagged():
+					continue
+				revealed += click_tile(row_int, col_int)
+				if tile.is_mine():
+					result.mine = (row_int, col_int)
+			elif action is CHORD:
+				chorded = self.chord_tile(row_int, col_int)
+				if not chorded:
+					continue
+				revealed += chorded
+				result.mine = next(((row, col) for row, col in chorded if grid[row][col].is_mine()), None)
+			else:
+				raise ValueError("{} is not an action that can be played on a board.".format(action))
+			result.applied += 1
+
+			if result.mine is not None:
+				result.status = CSStatus.LOST
+				break
+			if debug:
+				self.check_counters()
+			if self.num_clicked_cells == num_safe_cells or self.mines_flagged == self.mines:
+				result.status = CSStatus.WON
+				break
+		return result
+
 	def check_win_cond(self) -> bool:
+		if self.debug:
+			self.check_counters()
+
 		#check normal win
 		if(self.rows * self.cols == self.num_clicked_cells + self.mines):
 			return True
 		
 		#check flags win
+		return self.mines_flagged == self.mines
+
+	def count_cells(self) -> (int, int, int):
+		'''
+		Rescans the whole board for the number of clicked cells, flags placed and correctly flagged mines.
+		'''
+		clicked = 0
+		flags = 0
 		mines_flagged = 0
-		for row in range(self.rows):
-			for col in range(self.cols):
-				if (self.grid[row][col].is_mine() and self.grid[row][col].is_flagged()):
-					mines_flagged += 1
-		if (mines_flagged == self.mines):
-			return True
+		for row in self.grid:
+			for tile in row:
+				clicked += tile.is_clicked()
+				flags += tile.is_flagged()
+				mines_flagged += tile.is_mine() and tile.is_flagged()
+		return (clicked, flags, mines_flagged)
+
+	def cell_maps(self) -> (bytes, bytes, bytes):
+		'''
+		Returns the mine, clicked and flagged state of every cell in row-major order, one byte (0 or 1) per cell.
+		'''
+		getters = [attrgetter(name) for name in ('contains_mine', 'been_clicked', 'flagged')]
+		return tuple(b"".join([bytes(map(getter, row)) for row in self.grid]) for getter in getters)
+
+	def restore_cell_maps(self, mines: bytes, clicked: bytes, flagged: bytes):
+		'''
+		Puts the cell states taken by cell_maps back on a fresh board of the same size. The counters are left to the caller.
+		'''
+		cells = range(self.rows * self.cols)
+		self.plant_layout(list(compress(cells, mines)))
+		tiles = [tile for row in self.grid for tile in row]
+		for cell in compress(cells, clicked):
+			tiles[cell].been_clicked = True
+		for cell in compress(cells, flagged):
+			tiles[cell].flagged = True
 
-		return False    
+	def check_counters(self):
+		'''
+		Debug check that the running counters agree with a full rescan of the board.
+		'''
+		counted = self.count_cells()
+		if not self.mines_placed:
+			# a prepared layout's mines are not counted as flagged until they settle
+			counted = (counted[0], counted[1], 0)
+		tracked = (self.num_clicked_cells, self.flags_placed, self.mines_flagged)
+		if counted != tracked:
+			raise AssertionError("Board counters (clicked, flags, flagged mines) are {} but the board holds {}.".format(tracked, counted))
 
 
 
@@ -215,6 +538,9 @@ class CSTile:
 	'''
 	This class wraps all information about a minesweeper tile into one object.
 	'''
+	# no per-tile __dict__: a big board holds millions of these
+	__slots__ = ('contains_mine', 'been_clicked', 'flagged', 'num_mines_around')
+
 	def __init__(self):
 		self.contains_mine = False
 		self.been_clicked = False
@@ -282,9 +608,93 @@ class CSChoice(Enum):
 	RETURN = 1
 	FLAG = 2
 	CLICK = 3
+	CHORD = 4
+
+class CSStatus(Enum):
+	PLAYING = 0
+	WON = 1
+	LOST = 2
+
+class CSActionResult():
+	'''
+	What a batch of actions did to a board, as returned by CSBoard.apply_actions:
+	the cells revealed, the cells whose flag was toggled, how many actions were played,
+	the game's status afterwards, and the mine that went off if the game was lost.
+	'''
+	__slots__ = ("revealed", "flagged", "applied", "status", "mine")
+
+	def __init__(self):
+		self.revealed = []
+		self.flagged = []
+		self.applied = 0
+		self.status = CSStatus.PLAYING
+		self.mine = None
+
+	def changed_cells(self) -> [(int, int)]:
+		return self.revealed + self.flagged
 
 class CSDifficulty(Enum):
 	EASY = 0.08
 	NORMAL = 0.12
 	HARD = 0.17
 	BRUTAL = 0.25
+
+def mine_count(rows: int, cols: int, density: float) -> int:
+	'''
+	The number of mines a rows x cols board gets at a density such as a CSDifficulty's value.
+	Everything that turns a difficulty into mines goes through here, so the same board always gets the same count.
+	'''
+	return int(density * (rows * cols))
+
+class CSCellShuffle():
+	'''
+	A Fisher-Yates shuffle of range(num_cells), drawn one cell at a time.
+	Each draw takes O(1) time and never retries, and no cell is drawn twice,
+	so the first num_mines draws are a mine layout and the draws after them are free cells in random order.
+	'''
+	def __init__(self, rng: Random, num_cells: int):
+		self.rng = rng
+		self.num_cells = num_cells
+		self.drawn = 0
+		# only the shuffled positions that differ from the identity are stored
+		self.swapped = {}
+
+	def draw(self) -> int:
+		i = self.drawn
+		if i >= self.num_cells:
+			raise Exception("Every cell has already been drawn.")
+		j = self.rng.randrange(i, self.num_cells)
+		swapped = self.swapped
+		cell = swapped.get(j, j)
+		# position i is never read again, so its entry can go
+		swapped[j] = swapped.pop(i, i)
+		self.drawn = i + 1
+		return cell
+
+	def draw_many(self, count: int) -> [int]:
+		if count > self.num_cells - self.drawn:
+			raise Exception("The quantity of mines cannot exceed the number of free cells.")
+		draw = self.draw
+		return [draw() for _ in range(count)]
+
+BOARD_ENGINES = ["tiles", "arrays"]
+
+# the free cells a prepared layout keeps for emplace_mines: one for every cell of a first click's region at the default safe_radius
+LAYOUT_SPARE_CELLS = 9
+
+# bumped whenever the same seed and first click start giving a different mine layout,
+# so saved replays and board pools from before the change are not misread
+LAYOUT_VERSION = 3
+
+def create_board(grid_rows: int, grid_cols: int, num_mines: int, engine: str = "tiles", seed: int = None) -> CSBoard:
+	'''
+	Builds a board with the named engine. The "arrays" engine keeps the board state in NumPy arrays;
+	if NumPy is not installed, this falls back to the regular grid of CSTiles.
+	'''
+	if engine == "arrays":
+		try:
+			from bin.ConsoleSweeperArrays import CSArrayBoard
+			return CSArrayBoard(grid_rows, grid_cols, num_mines, seed)
+		except ImportError:
+			pass
+	return CSBoard(grid_rows, grid_cols, num_mines, seed)
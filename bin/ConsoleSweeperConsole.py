@@ -0,0 +1,93 @@
+'''
+This file draws the board for the console frontend, ConsoleSweeperNoCurses.py.
+
+Every frame is built as one string and written to the terminal in one call.
+In ANSI mode the board stays put at the top of the screen: once it is drawn, a move only rewrites
+the cells it changed, moving the cursor to each with an escape code, and clears the prompts below the board for the next move.
+'''
+
+import os
+import sys
+
+ANSI_HOME = "\x1b[H"
+ANSI_CLEAR_SCREEN = "\x1b[2J"
+ANSI_CLEAR_BELOW = "\x1b[J"
+
+# lines above the first grid row: the emoticon, a blank line and the column numbers
+GRID_TOP = 3
+# screen columns taken by the row numbers, and by each cell
+ROW_LABEL_WIDTH = 2
+CELL_WIDTH = 3
+# lines the prompts and messages of one move need below the board
+PROMPT_LINES = 6
+
+def ansi_supported(board, out) -> bool:
+	'''
+	Whether the board can be kept in place on this output: it has to be a terminal tall enough to hold the board and the prompts,
+	and the row numbers have to fit their column.
+	'''
+	if not (hasattr(out, "isatty") and out.isatty()) or board.rows >= 100:
+		return False
+	try:
+		height = os.get_terminal_size(out.fileno()).lines
+	except (OSError, ValueError):
+		return False
+	return height >= GRID_TOP + board.rows + 1 + PROMPT_LINES
+
+class CSConsoleRenderer():
+	'''
+	Writes frames of one board to a text stream and counts what it wrote.
+	'''
+	def __init__(self, board, out = None, ansi: bool = False):
+		self.board = board
+		self.out = out if out is not None else sys.stdout
+		self.ansi = ansi
+		# in ANSI mode, whether the board is on screen for cells to be rewritten in place
+		self.on_screen = False
+		self.writes = 0
+		self.bytes_written = 0
+
+	def write(self, text: str) -> int:
+		self.out.write(text)
+		self.out.flush()
+		num_bytes = len(text.encode())
+		self.writes += 1
+		self.bytes_written += num_bytes
+		return num_bytes
+
+	def draw(self, changed_cells: [(int, int)] = None) -> int:
+		'''
+		Draws the board as the player sees it. In ANSI mode, once the board is on screen, only the given cells are rewritten;
+		otherwise, or if changed_cells is None, the whole frame is. Returns the number of bytes written.
+		'''
+		board = self.board
+		if not self.ansi:
+			return self.write(board.grid_console_text())
+
+		# past a point, one whole frame is shorter than the escape codes for every cell
+		if not self.on_screen or changed_cells is None or len(changed_cells) * 4 >= board.rows * board.cols:
+			# the first frame clears the screen; later ones are written over the last, so nothing flickers
+			clear = "" if self.on_screen else ANSI_CLEAR_SCREEN
+			self.on_screen = True
+			return self.write(ANSI_HOME + clear + board.grid_console_text() + ANSI_CLEAR_BELOW)
+
+		parts = []
+		for row, col in changed_cells:
+			parts.append("\x1b[{};{}H".format(GRID_TOP + row + 1, ROW_LABEL_WIDTH + CELL_WIDTH * col + 1))
+			parts.append(board.grid[row][col].to_string())
+		# the prompts for the next move go under the board, over those of the last one
+		parts.append("\x1b[{};1H".format(GRID_TOP + board.rows + 2))
+		parts.append(ANSI_CLEAR_BELOW)
+		return self.write("".join(parts))
+
+	def draw_game_over(self, loss_row: int = -1, loss_col: int = -1) -> int:
+		'''
+		Draws the true board state in full, marking the mine at (loss_row, loss_col) as the one that went off.
+		Returns the number of bytes written.
+		'''
+		text = self.board.grid_console_text(True, loss_row, loss_col)
+		if self.ansi:
+			# the next game starts on a fresh screen
+			self.on_screen = False
+			text = ANSI_HOME + ANSI_CLEAR_SCREEN + text
+		return self.write(text)
@@ -0,0 +1,330 @@
+'''
+This file defines an unbounded board engine for an "infinite" Minesweeper mode.
+
+The world is split into square chunks keyed by chunk coordinate. A chunk's mines are generated from the
+world seed and its coordinate only when the chunk is first touched, so any chunk can be rebuilt at any time.
+Neighbour counts are taken across chunk borders from the mines of the surrounding chunks, and flood fills
+walk from chunk to chunk through the same in_bounds / reveal_tile / count_neighbours_deadly API as CSBoard.
+
+Only a bounded number of chunks are kept in memory, in least recently used order. Loading a chunk past the budget
+evicts the oldest: untouched chunks are simply dropped, since the seed brings them back, and chunks the player
+has clicked or flagged in are kept as a compressed copy of their state, which is restored on demand.
+
+The world is WORLD_SIZE cells on a side, which no player will walk across, so board coordinates stay
+non-negative and the frontends can keep treating it as a (very large) board with rows and cols.
+'''
+
+import zlib
+from collections import OrderedDict
+from random import Random
+
+from bin.ConsoleSweeperBones import CSBoard, CSTile
+
+CHUNK_BITS = 5
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK_SIZE - 1
+CHUNK_CELLS = CHUNK_SIZE * CHUNK_SIZE
+
+WORLD_SIZE = 1 << 20
+WORLD_CHUNKS = WORLD_SIZE // CHUNK_SIZE
+
+# about 3 KiB per loaded chunk, so the default budget is a few MiB whatever the distance walked
+DEFAULT_MAX_CHUNKS = 1024
+
+# how far an opening spreads from the click, in cells. At low densities the zeros join up into one region
+# that never ends, so an opening stops at this distance; a click on its edge carries it on from there
+FLOOD_RADIUS = 2 * CHUNK_SIZE
+
+# tile states, one byte per cell
+HIDDEN = 0
+CLICKED = 1
+FLAGGED = 2
+
+class CSChunk():
+	'''
+	One loaded chunk: its mine map and neighbour counts, which are None until the mines are placed,
+	and the player's state for each cell.
+	'''
+	__slots__ = ('mine_map', 'counts', 'state')
+
+	def __init__(self, state: bytearray):
+		self.mine_map = None
+		self.counts = None
+		self.state = state
+
+class CSInfiniteBoard(CSBoard):
+	'''
+	This class encodes the board state of an unbounded ConsoleSweeper world, generated chunk by chunk.
+	It exposes the same public API as CSBoard, including a grid of tile views. The game never ends in a win;
+	num_mines is the expected number of mines in the whole world, only there to keep the counters meaningful.
+	'''
+	infinite = True
+
+	def __init__(self, density: float, seed: int = None, max_chunks: int = DEFAULT_MAX_CHUNKS):
+		self.density = density
+		self.mines_per_chunk = round(density * CHUNK_CELLS)
+		self.max_chunks = max_chunks
+		super().__init__(WORLD_SIZE, WORLD_SIZE, self.mines_per_chunk * WORLD_CHUNKS * WORLD_CHUNKS, seed)
+
+	def make_board(self):
+		'''
+		Sets up the chunk tables. No chunk is generated until it is touched.
+		'''
+		self.chunks = OrderedDict() # loaded chunks, least recently used first
+		self.archive = {} # compressed states of evicted chunks the player has touched
+		self.layouts = OrderedDict() # generated mine layouts, which are cheap to rebuild
+		self.start = None
+		self.grid = CSChunkGrid(self)
+
+	def clear_board(self):
+		# the chunk tables are all there is to clear; the seed brings the new world's chunks in as they are touched
+		self.make_board()
+
+	def prepare_layout(self):
+		# chunks lay their mines out when they are first touched
+		pass
+
+	def prepare_layout_in_background(self):
+		pass
+
+	def emplace_mines(self, forbidden: [int], safe_radius: int = 1):
+		'''
+		Fixes the world around the first click: every chunk leaves the cells within safe_radius of it free of mines.
+		'''
+		self.start = (forbidden[0], forbidden[1], safe_radius)
+		self.layouts.clear()
+		self.mines_placed = True
+		self.mines_flagged = sum(1 for cell in self.flags_before_mines if self.grid[cell // self.cols][cell % self.cols].is_mine())
+		self.flags_before_mines = None
+
+	def chunk_layout(self, chunk_row: int, chunk_col: int) -> ([int], bytearray):
+		'''
+		Returns the chunk's mines as cell indices within the chunk, and as a map with a 1 for each mine.
+		The layout only depends on the world seed, the chunk's coordinate and the first click.
+		'''
+		key = (chunk_row, chunk_col)
+		layout = self.layouts.get(key)
+		if layout is not None:
+			self.layouts.move_to_end(key)
+			return layout
+
+		rng = Random(self.seed * WORLD_CHUNKS * WORLD_CHUNKS + chunk_row * WORLD_CHUNKS + chunk_col)
+		cells = rng.sample(range(CHUNK_CELLS), self.mines_per_chunk)
+		if self.start is not None:
+			# this only thins out the one to four chunks the first click's neighbourhood touches
+			start_row, start_col, radius = self.start
+			top = chunk_row * CHUNK_SIZE
+			left = chunk_col * CHUNK_SIZE
+			cells = [cell for cell in cells if abs(top + (cell >> CHUNK_BITS) - start_row) > radius
+				or abs(left + (cell & CHUNK_MASK) - start_col) > radius]
+
+		mine_map = bytearray(CHUNK_CELLS)
+		for cell in cells:
+			mine_map[cell] = 1
+		layout = (cells, mine_map)
+		self.layouts[key] = layout
+		if len(self.layouts) > 4 * self.max_chunks:
+			self.layouts.popitem(last = False)
+		return layout
+
+	def chunk_counts(self, chunk_row: int, chunk_col: int) -> bytearray:
+		'''
+		Counts the mines around every cell of the chunk, including the mines just over its borders.
+		'''
+		counts = bytearray(CHUNK_CELLS)
+		for d_row in (-1, 0, 1):
+			for d_col in (-1, 0, 1):
+				other_row = chunk_row + d_row
+				other_col = chunk_col + d_col
+				if not (0 <= other_row < WORLD_CHUNKS and 0 <= other_col < WORLD_CHUNKS):
+					continue
+				for cell in self.chunk_layout(other_row, other_col)[0]:
+					# the mine's position relative to this chunk
+					row = (cell >> CHUNK_BITS) + d_row * CHUNK_SIZE
+					col = (cell & CHUNK_MASK) + d_col * CHUNK_SIZE
+					if row < -1 or row > CHUNK_SIZE or col < -1 or col > CHUNK_SIZE:
+						continue
+					for x_nbr in range(max(row - 1, 0), min(row + 2, CHUNK_SIZE)):
+						for y_nbr in range(max(col - 1, 0), min(col + 2, CHUNK_SIZE)):
+							counts[(x_nbr << CHUNK_BITS) + y_nbr] += 1
+		return counts
+
+	def get_chunk(self, chunk_row: int, chunk_col: int) -> CSChunk:
+		'''
+		Returns a loaded chunk, restoring or generating it if need be. Loading can evict other chunks,
+		so callers look chunks up again rather than holding on to them.
+		'''
+		key = (chunk_row, chunk_col)
+		chunk = self.chunks.get(key)
+		if chunk is not None:
+			self.chunks.move_to_end(key)
+		else:
+			saved = self.archive.pop(key, None)
+			chunk = CSChunk(bytearray(zlib.decompress(saved)) if saved is not None else bytearray(CHUNK_CELLS))
+			self.chunks[key] = chunk
+			self.trim()
+
+		if chunk.counts is None and self.mines_placed:
+			chunk.mine_map = self.chunk_layout(chunk_row, chunk_col)[1]
+			chunk.counts = self.chunk_counts(chunk_row, chunk_col)
+		return chunk
+
+	def locate(self, row: int, col: int) -> (CSChunk, int):
+		'''
+		Returns the chunk holding a cell, and the cell's index within it.
+		'''
+		return (self.get_chunk(row >> CHUNK_BITS, col >> CHUNK_BITS), ((row & CHUNK_MASK) << CHUNK_BITS) + (col & CHUNK_MASK))
+
+	def trim(self):
+		'''
+		Evicts the least recently used chunks until the budget is met.
+		Touched chunks are kept compressed; untouched ones are dropped and regenerated when needed.
+		'''
+		while len(self.chunks) > self.max_chunks:
+			key, chunk = self.chunks.popitem(last = False)
+			if chunk.state.count(HIDDEN) != CHUNK_CELLS:
+				self.archive[key] = zlib.compress(bytes(chunk.state))
+
+	def memory_stats(self) -> (int, int, int):
+		'''
+		Returns the number of loaded chunks, the number of archived chunks and the archive's size in bytes.
+		'''
+		return (len(self.chunks), len(self.archive), sum(len(saved) for saved in self.archive.values()))
+
+	def cell_maps(self) -> (bytes, bytes, bytes):
+		raise NotImplementedError("An infinite board has no end to its cell maps.")
+
+	def in_bounds(self, row: int, col: int) -> bool:
+		return 0 <= row < self.rows and 0 <= col < self.cols
+
+	def count_neighbours_deadly(self, grid_row: int, grid_col: int) -> int:
+		chunk, cell = self.locate(grid_row, grid_col)
+		return chunk.counts[cell] if chunk.counts is not None else 0
+
+	def reveal_region(self, row_int: int, col_int: int) -> [(int, int)]:
+		'''
+		Reveals the cell and, from a zero, its opening, walking across chunk borders as it goes.
+		The opening only spreads FLOOD_RADIUS cells from the clicked one, so a click loads at most a few dozen chunks.
+		Returns the coordinates of every tile it revealed.
+		'''
+		if not self.mines_placed:
+			self.emplace_mines([row_int, col_int])
+		chunk, cell = self.locate(row_int, col_int)
+		if chunk.state[cell] == CLICKED:
+			return []
+
+		flags_cleared = 1 if chunk.state[cell] == FLAGGED else 0
+		chunk.state[cell] = CLICKED
+		revealed = [(row_int, col_int)]
+		to_visit = [(row_int, col_int)] if not chunk.mine_map[cell] and chunk.counts[cell] == 0 else []
+		top, bottom = max(row_int - FLOOD_RADIUS, 0), min(row_int + FLOOD_RADIUS, self.rows - 1)
+		left, right = max(col_int - FLOOD_RADIUS, 0), min(col_int + FLOOD_RADIUS, self.cols - 1)
+		while to_visit:
+			row, col = to_visit.pop()
+			for x_nbr in (row - 1, row, row + 1):
+				for y_nbr in (col - 1, col, col + 1):
+					# zeros on the edge stay revealed with hidden neighbours, which are safe to click
+					if not (top <= x_nbr <= bottom and left <= y_nbr <= right):
+						continue
+					chunk, cell = self.locate(x_nbr, y_nbr)
+					state = chunk.state[cell]
+					if state == CLICKED:
+						continue
+					if state == FLAGGED:
+						flags_cleared += 1
+					chunk.state[cell] = CLICKED
+					revealed.append((x_nbr, y_nbr))
+					if chunk.counts[cell] == 0:
+						to_visit.append((x_nbr, y_nbr))
+
+		# revealed tiles hand their flags back
+		self.num_clicked_cells += len(revealed)
+		self.flags_placed -= flags_cleared
+		self.flags_left += flags_cleared
+		return revealed
+
+	def count_cells(self) -> (int, int, int):
+		'''
+		Rescans every chunk the player has touched for the number of clicked cells, flags placed and correctly flagged mines.
+		'''
+		clicked = 0
+		flags = 0
+		mines_flagged = 0
+		states = [(key, chunk.state) for key, chunk in self.chunks.items()]
+		states += [(key, zlib.decompress(saved)) for key, saved in self.archive.items()]
+		for key, state in states:
+			clicked += state.count(CLICKED)
+			flags += state.count(FLAGGED)
+			if self.mines_placed:
+				mine_map = self.chunk_layout(*key)[1]
+				mines_flagged += sum(1 for cell in range(CHUNK_CELLS) if state[cell] == FLAGGED and mine_map[cell])
+		return (clicked, flags, mines_flagged)
+
+
+class CSChunkGrid():
+	'''
+	A read-only 2-D view over a CSInfiniteBoard that mimics the list-of-lists grid of CSBoard.
+	'''
+	def __init__(self, board: CSInfiniteBoard):
+		self.board = board
+
+	def __len__(self) -> int:
+		return self.board.rows
+
+	def __getitem__(self, row: int):
+		if not 0 <= row < self.board.rows:
+			raise IndexError("board row out of range")
+		return CSChunkRow(self.board, row)
+
+
+class CSChunkRow():
+	'''
+	A single row of tile views over a CSInfiniteBoard.
+	'''
+	def __init__(self, board: CSInfiniteBoard, row: int):
+		self.board = board
+		self.row = row
+
+	def __len__(self) -> int:
+		return self.board.cols
+
+	def __getitem__(self, col: int):
+		if not 0 <= col < self.board.cols:
+			raise IndexError("board column out of range")
+		return CSChunkTile(self.board, self.row, col)
+
+
+class CSChunkTile(CSTile):
+	'''
+	A thin view of one cell of a CSInfiniteBoard. It looks its chunk up on every call,
+	so it stays valid when the chunk is evicted and loaded again.
+	'''
+	__slots__ = ('board', 'row', 'col')
+
+	def __init__(self, board: CSInfiniteBoard, row: int, col: int):
+		self.board = board
+		self.row = row
+		self.col = col
+
+	def click(self):
+		chunk, cell = self.board.locate(self.row, self.col)
+		chunk.state[cell] = CLICKED
+	def is_clicked(self) -> bool:
+		chunk, cell = self.board.locate(self.row, self.col)
+		return chunk.state[cell] == CLICKED
+
+	def plant_flag(self, is_flag: bool):
+		chunk, cell = self.board.locate(self.row, self.col)
+		if chunk.state[cell] != CLICKED:
+			chunk.state[cell] = FLAGGED if is_flag else HIDDEN
+	def is_flagged(self) -> bool:
+		chunk, cell = self.board.locate(self.row, self.col)
+		return chunk.state[cell] == FLAGGED
+
+	def is_mine(self) -> bool:
+		chunk, cell = self.board.locate(self.row, self.col)
+		return chunk.mine_map is not None and chunk.mine_map[cell] == 1
+
+	@property
+	def num_mines_around(self) -> int:
+		return self.board.count_neighbours_deadly(self.row, self.col)
@@ -0,0 +1,180 @@
+'''
+This file generates "no-guess" boards: boards that can be cleared by logic alone from their first click.
+
+A board is fully described by its seed and its first click, so a no-guess board is stored as (seed, start row, start col).
+Candidates are checked by playing them with the solver, across a process pool, and accepted boards are kept
+in an on-disk pool with one file per (rows, cols, mines). Starting a game then only has to take a record off the pool;
+a pool that runs dry is refilled on a background thread, and games go on with regular boards until it is.
+
+To fill the pool ahead of time, run from the repository root, e.g.:
+
+	python -m bin.ConsoleSweeperNoGuess --rows 15 --cols 20 --difficulty NORMAL --boards 100
+'''
+
+import os
+import struct
+import threading
+from random import Random, getrandbits
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSChoice, CSDifficulty
+from bin.ConsoleSweeperSolver import CSSolver
+from bin.ConsoleSweeperProbability import mine_probabilities
+
+# seed, start row, start col
+POOL_RECORD = struct.Struct("<QII")
+
+# how many candidates to try before giving up on a board size that is too dense to be solved by logic
+MAX_CANDIDATES = 20000
+
+# guards the pool files, which background refills append to while games take boards off the end, and the table of refills
+POOL_LOCK = threading.Lock()
+# the refill thread last started for each pool file
+REFILLS = {}
+
+def start_cell(rows: int, cols: int, seed: int) -> (int, int):
+	'''
+	The first click for a candidate board, drawn from its own generator derived from the board's seed.
+	'''
+	return divmod(Random("start-{}".format(seed)).randrange(rows * cols), cols)
+
+def solves_without_guessing(rows: int, cols: int, mines: int, seed: int, start: (int, int)) -> bool:
+	'''
+	Plays the board from its first click using only moves that are certain, and reports whether that clears it.
+	Moves the solver's rules miss are looked for in the exact mine odds, where a zero means the cell is safe.
+	'''
+	board = ConsoleSweeperBones.CSBoard(rows, cols, mines, seed)
+	solver = CSSolver(board)
+	solver.update(board.click_tile(*start))
+
+	while not board.check_win_cond():
+		hint = solver.hint()
+		if hint is not None and hint[0] == CSChoice.CLICK:
+			move = hint[1:]
+		else:
+			odds = mine_probabilities(solver)
+			if not odds.exact:
+				return False
+			safe = [cell for cell, value in odds.frontier_odds.items() if value == 0]
+			if safe:
+				move = divmod(safe[0], cols)
+			elif odds.num_interior > 0 and odds.interior_odds == 0:
+				# every mine left is accounted for on the frontier, so any interior cell is safe
+				move = next((row, col) for row in range(rows) for col in range(cols)
+					if not board.grid[row][col].is_clicked() and row * cols + col not in solver.safe
+					and row * cols + col not in solver.mines and row * cols + col not in odds.frontier_odds)
+			else:
+				return False
+		solver.update(board.click_tile(*move))
+	return True
+
+def check_candidates(job: (int, int, int, int, int)) -> [(int, int, int)]:
+	'''
+	Worker entry point: checks candidate seeds first_seed, first_seed + 1, ... and returns the accepted boards.
+	'''
+	rows, cols, mines, first_seed, num_candidates = job
+	accepted = []
+	for seed in range(first_seed, first_seed + num_candidates):
+		start = start_cell(rows, cols, seed)
+		if solves_without_guessing(rows, cols, mines, seed, start):
+			accepted.append((seed, *start))
+	return accepted
+
+def generate_boards(rows: int, cols: int, mines: int, count: int, processes: int = None, chunk_size: int = 20,
+		max_candidates: int = MAX_CANDIDATES) -> [(int, int, int)]:
+	'''
+	Checks random candidates across a process pool until at least count boards are accepted,
+	and returns every accepted (seed, start row, start col). Returns fewer if max_candidates run out.
+	'''
+	# candidate seeds stay well clear of the 64-bit limit of the pool records
+	base = getrandbits(48)
+	jobs = [(rows, cols, mines, base + first, min(chunk_size, max_candidates - first)) for first in range(0, max_candidates, chunk_size)]
+
+	found = []
+	# multiprocessing takes tens of milliseconds to import, so it waits until boards are actually generated
+	from multiprocessing import Pool
+	with Pool(processes) as pool:
+		for accepted in pool.imap_unordered(check_candidates, jobs):
+			found.extend(accepted)
+			if len(found) >= count:
+				break
+	return found
+
+def pool_path(pool_dir: str, rows: int, cols: int, mines: int) -> str:
+	return os.path.join(pool_dir, "{}x{}-{}-v{}.pool".format(rows, cols, mines, ConsoleSweeperBones.LAYOUT_VERSION))
+
+def pool_size(pool_dir: str, rows: int, cols: int, mines: int) -> int:
+	try:
+		return os.path.getsize(pool_path(pool_dir, rows, cols, mines)) // POOL_RECORD.size
+	except OSError:
+		return 0
+
+def add_boards(pool_dir: str, rows: int, cols: int, mines: int, boards: [(int, int, int)]):
+	os.makedirs(pool_dir, exist_ok = True)
+	with POOL_LOCK, open(pool_path(pool_dir, rows, cols, mines), 'ab') as pool_fp:
+		pool_fp.write(b"".join(POOL_RECORD.pack(*board) for board in boards))
+
+def take_board(pool_dir: str, rows: int, cols: int, mines: int) -> (int, int, int):
+	'''
+	Removes the last board from the pool and returns it as (seed, start row, start col), or None if the pool is empty.
+	'''
+	try:
+		pool_fp = open(pool_path(pool_dir, rows, cols, mines), 'r+b')
+	except OSError:
+		return None
+	with POOL_LOCK, pool_fp:
+		size = pool_fp.seek(0, os.SEEK_END) // POOL_RECORD.size * POOL_RECORD.size
+		if size == 0:
+			return None
+		pool_fp.seek(size - POOL_RECORD.size)
+		board = POOL_RECORD.unpack(pool_fp.read(POOL_RECORD.size))
+		pool_fp.truncate(size - POOL_RECORD.size)
+	return board
+
+def next_board(pool_dir: str, rows: int, cols: int, mines: int, refill: int = 20) -> (int, int, int):
+	'''
+	Takes a board from the pool. Generating boards can take seconds, so a pool that is empty, or emptied by this call,
+	is refilled on a background thread instead of holding the game up.
+	Returns None while there is no board to take; the caller deals a regular board instead.
+	'''
+	board = take_board(pool_dir, rows, cols, mines)
+	if board is None or pool_size(pool_dir, rows, cols, mines) == 0:
+		refill_in_background(pool_dir, rows, cols, mines, refill)
+	return board
+
+def refill_in_background(pool_dir: str, rows: int, cols: int, mines: int, count: int) -> threading.Thread:
+	'''
+	Starts generating count boards into the pool on a daemon thread, unless that pool is already being refilled.
+	Returns the thread doing the refill.
+	'''
+	path = pool_path(pool_dir, rows, cols, mines)
+	with POOL_LOCK:
+		thread = REFILLS.get(path)
+		if thread is None or not thread.is_alive():
+			thread = threading.Thread(target = refill_pool, args = (pool_dir, rows, cols, mines, count), daemon = True)
+			REFILLS[path] = thread
+			thread.start()
+	return thread
+
+def refill_pool(pool_dir: str, rows: int, cols: int, mines: int, count: int):
+	add_boards(pool_dir, rows, cols, mines, generate_boards(rows, cols, mines, count))
+
+def main():
+	import argparse
+	parser = argparse.ArgumentParser(description = "Generate no-guess boards into the board pool.")
+	parser.add_argument("--rows", type = int, default = 15)
+	parser.add_argument("--cols", type = int, default = 20)
+	parser.add_argument("--difficulty", default = "NORMAL", choices = [difficulty.name for difficulty in CSDifficulty])
+	parser.add_argument("--boards", type = int, default = 100)
+	parser.add_argument("--pool-dir", default = "./boardpool")
+	parser.add_argument("--processes", type = int, default = None, help = "worker processes (default: one per core)")
+	args = parser.parse_args()
+
+	num_mines = ConsoleSweeperBones.mine_count(args.rows, args.cols, CSDifficulty[args.difficulty].value)
+	boards = generate_boards(args.rows, args.cols, num_mines, args.boards, args.processes)
+	add_boards(args.pool_dir, args.rows, args.cols, num_mines, boards)
+	print("Added {} boards; the {}x{} pool with {} mines now holds {}.".format(len(boards), args.rows, args.cols, num_mines,
+		pool_size(args.pool_dir, args.rows, args.cols, num_mines)))
+
+if __name__ == "__main__":
+	main()
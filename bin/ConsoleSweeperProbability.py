@@ -0,0 +1,246 @@
+'''
+This file computes the exact chance that each unsettled cell holds a mine, for when the solver cannot prove any move.
+
+Cells next to revealed numbers (the frontier) are split into components that share no number.
+Each component's mine layouts are counted by backtracking, grouped by how many mines they use,
+and the components are then combined with the cells no number touches, weighting every combination
+by the number of ways the remaining mines can be spread over those untouched cells.
+
+Components are memoized by a signature that only depends on their shape, so regions that have not
+changed since the last call, or that repeat elsewhere on the board, are not counted again.
+Components too large to enumerate fall back to an estimate, and the result is then marked as inexact.
+'''
+
+from functools import lru_cache
+from math import exp, lgamma
+
+from bin.ConsoleSweeperSolver import CSSolver
+
+# components with more cells than this are estimated instead of enumerated
+MAX_COMPONENT_CELLS = 48
+
+# backtracking gives up on a component after visiting this many partial layouts
+MAX_SEARCH_NODES = 200000
+
+class CSMineOdds():
+	'''
+	Mine probabilities for a board's cells. frontier_odds maps each unsettled frontier cell (row * cols + col)
+	to its probability, and interior_odds is shared by the num_interior unsettled cells that no revealed number touches.
+	'''
+	def __init__(self, solver: CSSolver, frontier_odds: dict, interior_odds: float, num_interior: int, exact: bool):
+		self.solver = solver
+		self.frontier_odds = frontier_odds
+		self.interior_odds = interior_odds
+		self.num_interior = num_interior
+		self.exact = exact
+
+	def odds(self, row: int, col: int) -> float:
+		cell = row * self.solver.board.cols + col
+		if cell in self.solver.mines:
+			return 1.0
+		if cell in self.solver.safe or self.solver.board.grid[row][col].is_clicked():
+			return 0.0
+		return self.frontier_odds.get(cell, self.interior_odds)
+
+def split_components(constraints: [(frozenset, int)]) -> [[(frozenset, int)]]:
+	'''
+	Groups constraints that share cells, directly or through other constraints.
+	'''
+	parent = {}
+
+	def find(cell: int) -> int:
+		while parent[cell] != cell:
+			parent[cell] = parent[parent[cell]]
+			cell = parent[cell]
+		return cell
+
+	for unknown, _ in constraints:
+		root = None
+		for cell in unknown:
+			parent.setdefault(cell, cell)
+			if root is None:
+				root = find(cell)
+			else:
+				other = find(cell)
+				if other != root:
+					parent[other] = root
+
+	groups = {}
+	for constraint in constraints:
+		groups.setdefault(find(next(iter(constraint[0]))), []).append(constraint)
+	return list(groups.values())
+
+def component_signature(component: [(frozenset, int)]) -> ([int], tuple):
+	'''
+	Returns the component's cells in board order, and a signature that numbers the cells by that order.
+	Two components with the same shape and counts get the same signature wherever they are on the board.
+	'''
+	cells = sorted(set().union(*(unknown for unknown, _ in component)))
+	local = {cell: ind for ind, cell in enumerate(cells)}
+	constraints = set((tuple(sorted(local[cell] for cell in unknown)), remaining) for unknown, remaining in component)
+	return (cells, (len(cells), tuple(sorted(constraints))))
+
+@lru_cache(maxsize = 4096)
+def count_layouts(signature: tuple) -> dict:
+	'''
+	Counts the component's mine layouts by backtracking over its cells in order.
+	Returns {mines used: (number of layouts, [layouts with a mine on each cell])},
+	or None if the search ran past MAX_SEARCH_NODES.
+	'''
+	num_cells, constraints = signature
+	cell_constraints = [[] for i in range(num_cells)]
+	for ind, (cells, _) in enumerate(constraints):
+		for cell in cells:
+			cell_constraints[cell].append(ind)
+
+	# mines each constraint still needs, and cells it still has to place them in
+	need = [remaining for _, remaining in constraints]
+	left = [len(cells) for cells, _ in constraints]
+	layout = [0] * num_cells
+	totals = {}
+	nodes = 0
+
+	def place(cell: int, mines: int) -> bool:
+		nonlocal nodes
+		nodes += 1
+		if nodes > MAX_SEARCH_NODES:
+			return False
+		if cell == num_cells:
+			entry = totals.get(mines)
+			if entry is None:
+				entry = totals[mines] = [0, [0] * num_cells]
+			entry[0] += 1
+			cell_counts = entry[1]
+			for ind in range(num_cells):
+				cell_counts[ind] += layout[ind]
+			return True
+
+		for value in (0, 1):
+			if any(need[ind] < value or need[ind] - value > left[ind] - 1 for ind in cell_constraints[cell]):
+				continue
+			for ind in cell_constraints[cell]:
+				need[ind] -= value
+				left[ind] -= 1
+			layout[cell] = value
+			finished = place(cell + 1, mines + value)
+			for ind in cell_constraints[cell]:
+				need[ind] += value
+				left[ind] += 1
+			if not finished:
+				return False
+		layout[cell] = 0
+		return True
+
+	if not place(0, 0):
+		return None
+	return {mines: (configs, tuple(cell_counts)) for mines, (configs, cell_counts) in totals.items()}
+
+def estimate_layouts(cells: [int], component: [(frozenset, int)]) -> dict:
+	'''
+	The fallback for components too large to enumerate: each cell gets the average density of the numbers
+	around it, and the component is assumed to hold the nearest whole number of mines to their sum.
+	'''
+	densities = {cell: [] for cell in cells}
+	for unknown, remaining in component:
+		for cell in unknown:
+			densities[cell].append(remaining / len(unknown))
+	odds = tuple(sum(found) / len(found) for found in (densities[cell] for cell in cells))
+	return {round(sum(odds)): (1.0, odds)}
+
+def convolve(a: [float], b: [float]) -> [float]:
+	out = [0.0] * (len(a) + len(b) - 1)
+	for i, x in enumerate(a):
+		if x:
+			for j, y in enumerate(b):
+				out[i + j] += x * y
+	return out
+
+def mine_probabilities(solver: CSSolver) -> CSMineOdds:
+	'''
+	Computes the mine probability of every unsettled cell on the solver's board.
+	'''
+	solver.propagate()
+	board = solver.board
+
+	constraints = []
+	for cell in list(solver.frontier):
+		found = solver.constraint(cell)
+		if found is not None:
+			constraints.append(found)
+
+	exact = True
+	components = []
+	for component in split_components(constraints):
+		cells, signature = component_signature(component)
+		layouts = count_layouts(signature) if len(cells) <= MAX_COMPONENT_CELLS else None
+		if layouts is None:
+			layouts = estimate_layouts(cells, component)
+			exact = False
+		components.append((cells, layouts))
+
+	# the unsettled cells no number touches, and the mines not yet proven
+	num_frontier = sum(len(cells) for cells, _ in components)
+	num_interior = board.rows * board.cols - board.num_clicked_cells - len(solver.mines) - len(solver.safe) - num_frontier
+	mines_left = board.mines - len(solver.mines)
+
+	# each component as a polynomial in its mine count, scaled to keep products in floating point range
+	polys = []
+	for cells, layouts in components:
+		poly = [0.0] * (max(layouts) + 1)
+		for mines, (configs, _) in layouts.items():
+			poly[mines] = float(configs)
+		top = max(poly)
+		polys.append([value / top for value in poly])
+
+	# the product of every other component's polynomial, for each component
+	prefix = [[1.0]]
+	for poly in polys:
+		prefix.append(convolve(prefix[-1], poly))
+	suffix = [[1.0]]
+	for poly in reversed(polys):
+		suffix.append(convolve(suffix[-1], poly))
+	suffix.reverse()
+
+	# ways to place the rest of the mines in the interior, relative to the likeliest count
+	total_degree = len(prefix[-1]) - 1
+	log_ways = []
+	for frontier_mines in range(total_degree + 1):
+		interior_mines = mines_left - frontier_mines
+		if 0 <= interior_mines <= num_interior:
+			log_ways.append(lgamma(num_interior + 1) - lgamma(interior_mines + 1) - lgamma(num_interior - interior_mines + 1))
+		else:
+			log_ways.append(None)
+	valid = [value for value in log_ways if value is not None]
+	if valid:
+		peak = max(valid)
+		ways = [exp(value - peak) if value is not None else 0.0 for value in log_ways]
+	else:
+		# the mine count cannot be met, which only happens with estimated components; ignore it
+		ways = [1.0] * (total_degree + 1)
+		exact = False
+
+	total = sum(weight * way for weight, way in zip(prefix[-1], ways))
+	if total <= 0:
+		ways = [1.0] * (total_degree + 1)
+		total = sum(prefix[-1])
+		exact = False
+
+	frontier_odds = {}
+	for ind, (cells, layouts) in enumerate(components):
+		rest = convolve(prefix[ind], suffix[ind + 1])
+		top = max(configs for configs, _ in layouts.values())
+		cell_weights = [0.0] * len(cells)
+		for mines, (configs, cell_counts) in layouts.items():
+			factor = sum(weight * ways[mines + s] for s, weight in enumerate(rest)) / top
+			for cell_ind, count in enumerate(cell_counts):
+				cell_weights[cell_ind] += count * factor
+		for cell, weight in zip(cells, cell_weights):
+			frontier_odds[cell] = weight / total
+
+	# expected interior mines, spread evenly
+	interior_odds = 0.0
+	if num_interior > 0:
+		expected = sum(weight * way * (mines_left - frontier_mines) for frontier_mines, (weight, way) in enumerate(zip(prefix[-1], ways)))
+		interior_odds = expected / total / num_interior
+
+	return CSMineOdds(solver, frontier_odds, interior_odds, num_interior, exact)
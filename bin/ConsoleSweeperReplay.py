@@ -0,0 +1,146 @@
+'''
+This file defines a compact, append-only binary replay format for Minesweeper games, and a fast replayer.
+
+A replay starts with a fixed header holding the board's seed, dimensions and mine count.
+Since the seed and the first click decide the whole mine layout, the header plus the list of actions
+is enough to rebuild the board exactly as it was after any action, without rendering anything.
+Each action is one varint: (row * cols + col) << 2 | action code, so most actions take 1-3 bytes.
+
+Replays can be checked from the repository root with:
+
+	python -m bin.ConsoleSweeperReplay replays/*.csr
+'''
+
+import os
+import struct
+import sys
+import time
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSChoice
+
+REPLAY_MAGIC = b"CSRP"
+# bumped whenever the records change meaning
+REPLAY_FORMAT = 2
+# a replay can only be read back with the record format and the mine layouts it was written with, so both go into its version
+REPLAY_VERSION = (REPLAY_FORMAT << 4) | ConsoleSweeperBones.LAYOUT_VERSION
+REPLAY_EXTENSION = ".csr"
+
+# magic, version, seed, rows, cols, mines
+REPLAY_HEADER = struct.Struct("<4sBQIII")
+
+# action codes live in the low bits of each record
+ACTION_BITS = 2
+ACTION_CODES = {CSChoice.CLICK: 0, CSChoice.FLAG: 1, CSChoice.CHORD: 2}
+ACTIONS_BY_CODE = {code: action for action, code in ACTION_CODES.items()}
+
+def encode_varint(value: int) -> bytes:
+	'''
+	Encodes a non-negative integer 7 bits at a time, low bits first.
+	'''
+	out = bytearray()
+	while value >= 0x80:
+		out.append((value & 0x7F) | 0x80)
+		value >>= 7
+	out.append(value)
+	return bytes(out)
+
+class CSReplayWriter():
+	'''
+	Appends a board's actions to a replay file as they happen.
+	Attach it with board.action_log = writer; the board then records every click and flag itself.
+	Each record is flushed as it is written, so the file is a valid replay even if the game is abandoned.
+	'''
+	def __init__(self, path: str, board: ConsoleSweeperBones.CSBoard):
+		self.cols = board.cols
+		self.file = open(path, 'wb')
+		self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, board.seed, board.rows, board.cols, int(board.mines)))
+		self.file.flush()
+
+	def record(self, action: CSChoice, row: int, col: int):
+		self.file.write(encode_varint(((row * self.cols + col) << ACTION_BITS) | ACTION_CODES[action]))
+		self.file.flush()
+
+	def close(self):
+		self.file.close()
+
+def open_replay_writer(board: ConsoleSweeperBones.CSBoard, replay_dir: str) -> CSReplayWriter:
+	'''
+	Starts recording the board into a new, timestamped file in replay_dir.
+	'''
+	os.makedirs(replay_dir, exist_ok = True)
+	file_name = time.strftime("%Y%m%d-%H%M%S") + "-{:016x}".format(board.seed) + REPLAY_EXTENSION
+	writer = CSReplayWriter(os.path.join(replay_dir, file_name), board)
+	board.action_log = writer
+	return writer
+
+class CSReplay():
+	'''
+	A decoded replay: the board's seed, dimensions and mine count, and its actions as (CSChoice, row, col) tuples.
+	'''
+	def __init__(self, seed: int, rows: int, cols: int, mines: int, actions: [(CSChoice, int, int)]):
+		self.seed = seed
+		self.rows = rows
+		self.cols = cols
+		self.mines = mines
+		self.actions = actions
+
+	@classmethod
+	def from_bytes(cls, data: bytes):
+		magic, version, seed, rows, cols, mines = REPLAY_HEADER.unpack_from(data)
+		if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+			raise ValueError("Not a version {} ConsoleSweeper replay.".format(REPLAY_VERSION))
+
+		actions = []
+		value = 0
+		shift = 0
+		for byte in memoryview(data)[REPLAY_HEADER.size:]:
+			value |= (byte & 0x7F) << shift
+			if byte & 0x80:
+				shift += 7
+				continue
+			row, col = divmod(value >> ACTION_BITS, cols)
+			actions.append((ACTIONS_BY_CODE[value & ((1 << ACTION_BITS) - 1)], row, col))
+			value = 0
+			shift = 0
+		return cls(seed, rows, cols, mines, actions)
+
+	@classmethod
+	def load(cls, path: str):
+		with open(path, 'rb') as replay_fp:
+			return cls.from_bytes(replay_fp.read())
+
+	def board_at(self, num_actions: int = None, engine: str = "tiles") -> ConsoleSweeperBones.CSBoard:
+		'''
+		Rebuilds the board as it was after the first num_actions actions (all of them by default).
+		'''
+		board = ConsoleSweeperBones.create_board(self.rows, self.cols, self.mines, engine, self.seed)
+		board.apply_actions(self.actions[:num_actions])
+		return board
+
+	def result(self, engine: str = "tiles") -> str:
+		'''
+		Replays the whole game, checks the board's counters against a full rescan, and reports how the game ended.
+		'''
+		board = self.board_at(None, engine)
+		board.check_counters()
+		# a click or a chord can set a mine off
+		mines, clicked, _ = board.cell_maps()
+		if any(mine and click for mine, click in zip(mines, clicked)):
+			return "lost"
+		if board.check_win_cond():
+			return "won"
+		return "unfinished"
+
+def main(paths: [str]) -> int:
+	start = time.perf_counter()
+	for path in paths:
+		replay = CSReplay.load(path)
+		print("{}: {}x{}, {} mines, {} actions, {}".format(path, replay.rows, replay.cols, replay.mines, len(replay.actions), replay.result()))
+	elapsed = time.perf_counter() - start
+	if paths:
+		print("{} replays verified in {:.3f}s ({:.0f} per second)".format(len(paths), elapsed, len(paths) / max(elapsed, 1e-9)))
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,208 @@
+'''
+This file keeps the scoreboard: every finished game, in an SQLite database.
+
+Finished games are handed to a CSScoreWriter, which queues them for a background thread.
+The thread writes whatever has queued up in one transaction, so finishing a game never waits on the disk.
+The table is indexed by board size, difficulty and result, ordered by time, so the best times for a
+board size, overall or for one player, are read straight off an index however many games are stored.
+'''
+
+import getpass
+import queue
+import sqlite3
+import threading
+import time
+
+from bin.ConsoleSweeperBones import CSDifficulty, mine_count
+
+SCHEMA = [
+	"""CREATE TABLE IF NOT EXISTS games (
+		id INTEGER PRIMARY KEY,
+		finished REAL NOT NULL,
+		player TEXT NOT NULL,
+		rows INTEGER NOT NULL,
+		cols INTEGER NOT NULL,
+		mines INTEGER NOT NULL,
+		difficulty TEXT NOT NULL,
+		mode TEXT NOT NULL,
+		result TEXT NOT NULL,
+		seconds REAL NOT NULL,
+		clicks INTEGER NOT NULL
+	)""",
+	"CREATE INDEX IF NOT EXISTS games_best ON games (rows, cols, difficulty, result, seconds)",
+	"CREATE INDEX IF NOT EXISTS games_player_best ON games (player, rows, cols, difficulty, result, seconds)",
+	# running totals per board size and difficulty, so that counting games never scans them
+	"""CREATE TABLE IF NOT EXISTS totals (
+		rows INTEGER NOT NULL,
+		cols INTEGER NOT NULL,
+		difficulty TEXT NOT NULL,
+		played INTEGER NOT NULL,
+		won INTEGER NOT NULL,
+		PRIMARY KEY (rows, cols, difficulty)
+	)""",
+	"""CREATE TRIGGER IF NOT EXISTS count_game AFTER INSERT ON games BEGIN
+		INSERT INTO totals VALUES (new.rows, new.cols, new.difficulty, 1, new.result = 'won')
+			ON CONFLICT (rows, cols, difficulty) DO UPDATE SET played = played + 1, won = won + (new.result = 'won');
+	END""",
+]
+
+INSERT_GAME = """INSERT INTO games (finished, player, rows, cols, mines, difficulty, mode, result, seconds, clicks)
+	VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# the most games written in one transaction
+MAX_BATCH = 512
+
+# how often, in seconds, a flush checks that the writer thread is still there to finish the queue
+FLUSH_POLL = 0.1
+
+def connect(db_path: str) -> sqlite3.Connection:
+	'''
+	Opens the database, creating the table and its indexes if they are missing.
+	'''
+	connection = sqlite3.connect(db_path)
+	# readers do not block the writer thread, and commits do not wait for a full sync
+	connection.execute("PRAGMA journal_mode = WAL")
+	connection.execute("PRAGMA synchronous = NORMAL")
+	for statement in SCHEMA:
+		connection.execute(statement)
+	connection.commit()
+	return connection
+
+def difficulty_name(rows: int, cols: int, mines: int) -> str:
+	'''
+	Names the difficulty a board's mine count comes from, or "CUSTOM" if it matches none of them.
+	'''
+	for difficulty in CSDifficulty:
+		if mine_count(rows, cols, difficulty.value) == mines:
+			return difficulty.name
+	return "CUSTOM"
+
+def current_player() -> str:
+	try:
+		return getpass.getuser()
+	except Exception:
+		return "player"
+
+class CSScoreWriter():
+	'''
+	Records finished games from a background thread, in batches.
+	If the database fails, the thread stops; flush and close raise its error rather than wait for it.
+	'''
+	def __init__(self, db_path: str, player: str = None):
+		self.db_path = db_path
+		self.player = player if player is not None else current_player()
+		self.pending = queue.Queue()
+		# the error that stopped the writer thread, if one did
+		self.error = None
+		self.thread = threading.Thread(target = self.write_loop, daemon = True)
+		self.thread.start()
+
+	def record(self, rows: int, cols: int, mines: int, difficulty: str, mode: str, won: bool, seconds: float, clicks: int):
+		'''
+		Queues a finished game and returns at once.
+		'''
+		self.pending.put((time.time(), self.player, rows, cols, mines, difficulty, mode, "won" if won else "lost", seconds, clicks))
+
+	def flush(self, timeout: float = None) -> bool:
+		'''
+		Waits until every game recorded so far is on disk, or for at most timeout seconds if one is given.
+		Returns whether the queue was written out. Raises the error that stopped the writer thread, if one did.
+		'''
+		deadline = time.monotonic() + timeout if timeout is not None else None
+		done = self.pending.all_tasks_done
+		with done:
+			# a dead thread never finishes the queue, so it is checked on every wait
+			while self.pending.unfinished_tasks and self.thread.is_alive():
+				wait = FLUSH_POLL if deadline is None else min(FLUSH_POLL, deadline - time.monotonic())
+				if wait <= 0:
+					break
+				done.wait(wait)
+			written = self.pending.unfinished_tasks == 0
+		self.check()
+		return written
+
+	def close(self):
+		'''
+		Writes out the queue and stops the thread. Raises the error that stopped the writer thread, if one did.
+		'''
+		self.pending.put(None)
+		self.thread.join()
+		self.check()
+
+	def check(self):
+		'''
+		Raises the error that stopped the writer thread, if one did; games queued after it were not written.
+		'''
+		if self.error is not None:
+			raise self.error
+
+	def write_loop(self):
+		try:
+			self.write_batches()
+		except Exception as error:
+			# e.g. the database could not be opened
+			self.error = error
+
+	def write_batches(self):
+		connection = connect(self.db_path)
+		try:
+			running = True
+			while running:
+				batch = [self.pending.get()]
+				# take whatever else queued up while the last batch was being written
+				while len(batch) < MAX_BATCH:
+					try:
+						batch.append(self.pending.get_nowait())
+					except queue.Empty:
+						break
+
+				games = [game for game in batch if game is not None]
+				running = len(games) == len(batch)
+				try:
+					if games:
+						with connection:
+							connection.executemany(INSERT_GAME, games)
+				except Exception as error:
+					# the error goes down before the batch is marked done, so a flush waiting on the batch sees it
+					self.error = error
+					running = False
+				for i in range(len(batch)):
+					self.pending.task_done()
+		finally:
+			connection.close()
+
+def best_times(db_path: str, rows: int, cols: int, difficulty: str, limit: int = 10, player: str = None) -> [(float, int, float, str)]:
+	'''
+	Returns the fastest wins on a board size and difficulty as (seconds, clicks, finished, player), fastest first.
+	Only the given player's wins are counted if one is given.
+	'''
+	connection = connect(db_path)
+	try:
+		if player is None:
+			return connection.execute("""SELECT seconds, clicks, finished, player FROM games
+				WHERE rows = ? AND cols = ? AND difficulty = ? AND result = 'won' ORDER BY seconds LIMIT ?""",
+				(rows, cols, difficulty, limit)).fetchall()
+		return connection.execute("""SELECT seconds, clicks, finished, player FROM games
+			WHERE player = ? AND rows = ? AND cols = ? AND difficulty = ? AND result = 'won' ORDER BY seconds LIMIT ?""",
+			(player, rows, cols, difficulty, limit)).fetchall()
+	finally:
+		connection.close()
+
+def personal_best(db_path: str, rows: int, cols: int, difficulty: str, player: str = None) -> (float, int, float, str):
+	'''
+	Returns the player's fastest win on a board size and difficulty, or None if they have not won one yet.
+	'''
+	found = best_times(db_path, rows, cols, difficulty, 1, player if player is not None else current_player())
+	return found[0] if found else None
+
+def games_played(db_path: str, rows: int, cols: int, difficulty: str) -> (int, int):
+	'''
+	Returns how many games were played and how many were won on a board size and difficulty.
+	'''
+	connection = connect(db_path)
+	try:
+		found = connection.execute("SELECT played, won FROM totals WHERE rows = ? AND cols = ? AND difficulty = ?",
+			(rows, cols, difficulty)).fetchone()
+	finally:
+		connection.close()
+	return found if found is not None else (0, 0)
@@ -0,0 +1,56 @@
+'''
+This file defines a session: one game after another, played on as few boards as possible.
+
+Both frontends start every game through a session. When the next game is the same size as the last,
+the session clears the last game's board in place and hands it back, so a long run of games keeps reusing
+the same grid instead of building a new one each time, and memory stays flat however many games are played.
+'''
+
+from bin import ConsoleSweeperBones
+
+class CSSession():
+	'''
+	Hands out the board for each game in turn, and owns it until the next game replaces it.
+	Boards from elsewhere, e.g. a continued save, are handed over with adopt, so the games after them can reuse them too.
+	'''
+	def __init__(self, engine: str = "tiles"):
+		self.engine = engine
+		self.board = None
+		self.games = 0
+		self.boards_built = 0
+
+	def new_board(self, rows: int, cols: int, num_mines: int, seed: int = None) -> ConsoleSweeperBones.CSBoard:
+		'''
+		Returns an empty board for the next game: the last one, reset in place, if it has the same size, or else a new one.
+		Boards the session holds were all built with its engine, so size is all that has to match.
+		'''
+		board = self.board
+		if board is not None and board.rows == rows and board.cols == cols:
+			self.end_game()
+			board.reset(num_mines, seed)
+		else:
+			board = ConsoleSweeperBones.create_board(rows, cols, num_mines, self.engine, seed)
+			self.adopt(board)
+			self.boards_built += 1
+		self.games += 1
+		return board
+
+	def adopt(self, board: ConsoleSweeperBones.CSBoard):
+		'''
+		Makes board the session's board, letting go of the last one.
+		'''
+		self.end_game()
+		self.board = board
+
+	def end_game(self):
+		'''
+		Closes the replay of the game on the session's board, if one is being recorded. The board itself is kept for the next game.
+		'''
+		board = self.board
+		if board is not None and board.action_log is not None:
+			board.action_log.close()
+			board.action_log = None
+
+	def close(self):
+		self.end_game()
+		self.board = None
@@ -0,0 +1,60 @@
+'''
+This file reads the settings both frontends share from bin/settings.json.
+
+The file is only read the first time a setting is asked for, and kept from then on,
+so importing a frontend or any part of the engine never touches the disk.
+'''
+
+import json
+import os
+
+SETTINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json")
+
+# used for any setting missing from the file, and for all of them if the file cannot be read
+DEFAULT_SETTINGS = {
+	"grid_rows": 12,
+	"grid_cols": 12,
+	"difficulty": "NORMAL",
+	"colours": True,
+	"time_trial": False,
+	"time_limit": 100,
+	"board_engine": "tiles",
+	"record_replays": False,
+	"replay_dir": "./replays",
+	"board_mode": "random",
+	"board_pool_dir": "./boardpool",
+	"save_file": "./savegame.sav",
+	"score_db": "./scores.db",
+	"frame_rate": 60,
+	"console_ansi": False
+}
+
+loaded_settings = None
+
+def load_settings() -> dict:
+	'''
+	Returns the settings as they are in the file, reading it on first use.
+	The same dict is returned every time, so changes to it are seen everywhere and written back by save_settings.
+	'''
+	global loaded_settings
+	if loaded_settings is None:
+		try:
+			with open(SETTINGS_PATH) as settings_fp:
+				loaded_settings = json.load(settings_fp)
+		except (OSError, ValueError):
+			loaded_settings = dict(DEFAULT_SETTINGS)
+	return loaded_settings
+
+def get_setting(name: str):
+	'''
+	Returns one setting, or its default value if the file does not have it.
+	'''
+	return load_settings().get(name, DEFAULT_SETTINGS[name])
+
+def save_settings():
+	'''
+	Writes the settings back to the file, if they were ever read.
+	'''
+	if loaded_settings is not None:
+		with open(SETTINGS_PATH, 'w') as json_fp:
+			json.dump(loaded_settings, json_fp)
@@ -0,0 +1,232 @@
+'''
+This file runs Minesweeper games headlessly, without a frontend, to evaluate player policies and difficulty settings.
+Games are spread across a process pool and their results are aggregated as they stream in.
+Every game is seeded by its index, so a run is reproducible no matter how the games are scheduled.
+
+Run from the repository root, e.g.:
+
+	python -m bin.ConsoleSweeperSim --games 100000 --rows 16 --cols 30 --difficulty HARD --policy random
+'''
+
+import time
+from random import Random
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSChoice, CSDifficulty, CSStatus
+from bin.ConsoleSweeperSolver import CSSolver
+from bin.ConsoleSweeperProbability import mine_probabilities
+
+class CSPolicy():
+	'''
+	A player policy decides the next action for a headless game.
+	Subclasses override choose_action, which returns a (CSChoice.CLICK or CSChoice.FLAG, row, col) tuple,
+	and may override choose_actions, to hand the board several actions to play in one batch,
+	and observe, which is told the cells each batch revealed.
+	'''
+	def __init__(self, rng: Random):
+		self.rng = rng
+
+	def choose_action(self, board: ConsoleSweeperBones.CSBoard) -> (CSChoice, int, int):
+		raise NotImplementedError()
+
+	def choose_actions(self, board: ConsoleSweeperBones.CSBoard) -> [(CSChoice, int, int)]:
+		return [self.choose_action(board)]
+
+	def observe(self, board: ConsoleSweeperBones.CSBoard, revealed: [(int, int)]):
+		pass
+
+class CSRandomPolicy(CSPolicy):
+	'''
+	Clicks unrevealed cells in a random order. This is the baseline every other policy should beat.
+	'''
+	def __init__(self, rng: Random):
+		super().__init__(rng)
+		self.order = None
+
+	def choose_action(self, board: ConsoleSweeperBones.CSBoard) -> (CSChoice, int, int):
+		if self.order is None:
+			self.order = list(range(board.rows * board.cols))
+			self.rng.shuffle(self.order)
+
+		while True:
+			row, col = divmod(self.order.pop(), board.cols)
+			tile = board.grid[row][col]
+			if not (tile.is_clicked() or tile.is_flagged()):
+				return (CSChoice.CLICK, row, col)
+
+class CSSolverPolicy(CSPolicy):
+	'''
+	Clicks every cell the solver proves safe, and clicks a random cell not proven to be a mine when it has to guess.
+	'''
+	def __init__(self, rng: Random):
+		super().__init__(rng)
+		self.solver = None
+		self.guesses = CSRandomPolicy(rng)
+
+	def observe(self, board: ConsoleSweeperBones.CSBoard, revealed: [(int, int)]):
+		self.solver.update(revealed)
+
+	def choose_actions(self, board: ConsoleSweeperBones.CSBoard) -> [(CSChoice, int, int)]:
+		# every cell proven safe is clicked in one batch; cells an earlier click opens up are skipped by the board
+		if self.solver is not None:
+			safe = self.solver.safe_cells()
+			if safe:
+				return [(CSChoice.CLICK, row, col) for row, col in safe]
+		return [self.choose_action(board)]
+
+	def choose_action(self, board: ConsoleSweeperBones.CSBoard) -> (CSChoice, int, int):
+		if self.solver is None:
+			self.solver = CSSolver(board)
+
+		hint = self.solver.hint()
+		if hint is not None and hint[0] == CSChoice.CLICK:
+			return hint
+
+		while True:
+			action, row, col = self.guesses.choose_action(board)
+			if row * board.cols + col not in self.solver.mines:
+				return (action, row, col)
+
+class CSOddsPolicy(CSSolverPolicy):
+	'''
+	Like the solver policy, but when it has to guess it clicks the cell least likely to be a mine.
+	'''
+	def choose_action(self, board: ConsoleSweeperBones.CSBoard) -> (CSChoice, int, int):
+		if self.solver is None:
+			self.solver = CSSolver(board)
+
+		hint = self.solver.hint()
+		if hint is not None and hint[0] == CSChoice.CLICK:
+			return hint
+
+		odds = mine_probabilities(self.solver)
+		best = min(odds.frontier_odds, key = odds.frontier_odds.get, default = None)
+		if best is not None and (odds.num_interior == 0 or odds.frontier_odds[best] <= odds.interior_odds):
+			return (CSChoice.CLICK, *divmod(best, board.cols))
+
+		# every interior cell is as likely as any other
+		while True:
+			action, row, col = self.guesses.choose_action(board)
+			cell = row * board.cols + col
+			if cell not in self.solver.mines and cell not in odds.frontier_odds:
+				return (action, row, col)
+
+# policies by the name used on the command line
+POLICIES = {
+	"random": CSRandomPolicy,
+	"solver": CSSolverPolicy,
+	"odds": CSOddsPolicy
+}
+
+class CSSimStats():
+	'''
+	Running totals over a batch of games. Stats from different workers merge by addition.
+	'''
+	def __init__(self):
+		self.games = 0
+		self.wins = 0
+		self.clicks = 0
+		self.revealed = 0
+		self.seconds = 0.0
+
+	def add_game(self, won: bool, clicks: int, revealed: int, seconds: float):
+		self.games += 1
+		self.wins += won
+		self.clicks += clicks
+		self.revealed += revealed
+		self.seconds += seconds
+
+	def merge(self, other):
+		self.games += other.games
+		self.wins += other.wins
+		self.clicks += other.clicks
+		self.revealed += other.revealed
+		self.seconds += other.seconds
+
+	def summary(self) -> dict:
+		games = max(self.games, 1)
+		return {
+			"games": self.games,
+			"win_rate": self.wins / games,
+			"clicks_per_game": self.clicks / games,
+			"revealed_per_game": self.revealed / games,
+			"seconds_per_game": self.seconds / games
+		}
+
+def play_game(rows: int, cols: int, num_mines: int, policy_name: str, seed: int, engine: str = "tiles") -> (bool, int, int, float):
+	'''
+	Plays one game to the end and returns (won, clicks, revealed cells, seconds taken).
+	The board is seeded with seed, and the policy draws from its own generator derived from it.
+	'''
+	board = ConsoleSweeperBones.create_board(rows, cols, num_mines, engine, seed)
+	policy = POLICIES[policy_name](Random("policy-{}".format(seed)))
+
+	start = time.perf_counter()
+	status = CSStatus.PLAYING
+	while status == CSStatus.PLAYING:
+		result = board.apply_actions(policy.choose_actions(board))
+		if result.revealed:
+			policy.observe(board, result.revealed)
+		status = result.status
+
+	won = status == CSStatus.WON
+	return (won, board.clicks_so_far, board.num_clicked_cells, time.perf_counter() - start)
+
+def play_chunk(job: (int, int, int, str, str, int, int)) -> CSSimStats:
+	'''
+	Worker entry point: plays games first_seed, first_seed + 1, ... and returns their totals.
+	'''
+	rows, cols, num_mines, policy_name, engine, first_seed, num_games = job
+	stats = CSSimStats()
+	for seed in range(first_seed, first_seed + num_games):
+		stats.add_game(*play_game(rows, cols, num_mines, policy_name, seed, engine))
+	return stats
+
+def run_games(num_games: int, rows: int, cols: int, num_mines: int, policy_name: str = "random", seed: int = 0,
+		processes: int = None, chunk_size: int = 100, engine: str = "tiles"):
+	'''
+	Plays num_games games across a process pool, yielding the running CSSimStats after each chunk finishes.
+	Game i uses seed + i, so the final totals do not depend on the number of processes.
+	'''
+	if policy_name not in POLICIES:
+		raise ValueError("Unknown policy '{}'. Choose from: {}".format(policy_name, ", ".join(POLICIES)))
+
+	jobs = []
+	for first in range(0, num_games, chunk_size):
+		jobs.append((rows, cols, num_mines, policy_name, engine, seed + first, min(chunk_size, num_games - first)))
+
+	totals = CSSimStats()
+	# loaded here rather than at the top, so tools that only play games in-process never pay for it
+	from multiprocessing import Pool
+	with Pool(processes) as pool:
+		for stats in pool.imap_unordered(play_chunk, jobs):
+			totals.merge(stats)
+			yield totals
+
+def main():
+	import argparse
+	parser = argparse.ArgumentParser(description = "Play Minesweeper games headlessly and report aggregate results.")
+	parser.add_argument("--games", type = int, default = 1000)
+	parser.add_argument("--rows", type = int, default = 16)
+	parser.add_argument("--cols", type = int, default = 16)
+	parser.add_argument("--difficulty", default = "NORMAL", choices = [difficulty.name for difficulty in CSDifficulty])
+	parser.add_argument("--policy", default = "random", choices = list(POLICIES))
+	parser.add_argument("--seed", type = int, default = 0)
+	parser.add_argument("--processes", type = int, default = None, help = "worker processes (default: one per core)")
+	parser.add_argument("--chunk-size", type = int, default = 100, help = "games per worker task")
+	parser.add_argument("--engine", default = "tiles", choices = ConsoleSweeperBones.BOARD_ENGINES)
+	parser.add_argument("--report-every", type = int, default = 10000, help = "games between progress lines")
+	args = parser.parse_args()
+
+	num_mines = ConsoleSweeperBones.mine_count(args.rows, args.cols, CSDifficulty[args.difficulty].value)
+	start = time.perf_counter()
+	next_report = args.report_every
+	for totals in run_games(args.games, args.rows, args.cols, num_mines, args.policy, args.seed, args.processes, args.chunk_size, args.engine):
+		if totals.games >= next_report or totals.games == args.games:
+			summary = totals.summary()
+			summary["games_per_second"] = totals.games / (time.perf_counter() - start)
+			print(" ".join("{}={:.4g}".format(key, value) if isinstance(value, float) else "{}={}".format(key, value) for key, value in summary.items()), flush = True)
+			next_report += args.report_every
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,159 @@
+'''
+This file defines a constraint-propagation solver. It finds every cell the revealed numbers prove to be safe
+or to be a mine, for hints in the frontends and for headless play.
+
+Each revealed number says that its unknown neighbours hold a certain number of mines.
+The single-cell rule settles a number's neighbours when that count is zero or equals the number of unknown cells.
+The subset rule compares two nearby numbers: if one's unknown cells are a subset of the other's,
+the cells only the larger one sees hold the difference of their counts.
+
+The solver keeps its deductions between moves. A click only queues the cells it revealed and their neighbours,
+and a deduction only queues the numbers around the settled cell, so the work per move is proportional to
+what changed rather than to the size of the board.
+'''
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSChoice
+
+class CSSolver():
+	'''
+	Tracks what can be deduced about a board's unrevealed cells. Cells are flat indices (row * cols + col).
+	The player's flags are not trusted: only mines the solver has proven count as mines.
+	'''
+	def __init__(self, board: ConsoleSweeperBones.CSBoard):
+		self.board = board
+		self.safe = set() # proven safe, not revealed yet
+		self.mines = set() # proven mines
+		self.frontier = set() # revealed numbers that still border unsettled cells
+		self.dirty = set() # cells to re-examine
+		self.unflagged_mines = [] # proven mines not yet offered as a hint
+
+		# a board that is already in play is scanned once
+		if board.num_clicked_cells > 0:
+			self.update([(row, col) for row in range(board.rows) for col in range(board.cols) if board.grid[row][col].is_clicked()])
+
+	def update(self, revealed: [(int, int)]):
+		'''
+		Tells the solver which cells a click revealed, e.g. the list returned by CSBoard.click_tile.
+		The cells are only queued here; the deductions happen on the next call to propagate or hint.
+		'''
+		cols = self.board.cols
+		for row, col in revealed:
+			cell = row * cols + col
+			self.safe.discard(cell)
+			# the revealed cell is a new number, and its neighbours each have one fewer unknown cell
+			self.dirty.update(self.cells_within(cell, 1))
+
+	def cells_within(self, cell: int, radius: int) -> [int]:
+		'''
+		Returns the in-bounds cells at most radius rows and columns away from cell, including the cell itself.
+		'''
+		row, col = divmod(cell, self.board.cols)
+		rows = range(max(row - radius, 0), min(row + radius + 1, self.board.rows))
+		cols = range(max(col - radius, 0), min(col + radius + 1, self.board.cols))
+		return [r * self.board.cols + c for r in rows for c in cols]
+
+	def constraint(self, cell: int) -> (frozenset, int):
+		'''
+		Returns the cell's unsettled neighbours and how many mines they hold,
+		or None if the cell is not a revealed number with unsettled neighbours.
+		'''
+		row, col = divmod(cell, self.board.cols)
+		tile = self.board.grid[row][col]
+		if not tile.is_clicked():
+			return None
+
+		grid = self.board.grid
+		cols = self.board.cols
+		unknown = []
+		remaining = tile.num_mines_around
+		for other in self.cells_within(cell, 1):
+			if other in self.mines:
+				remaining -= 1
+			elif other not in self.safe and not grid[other // cols][other % cols].is_clicked():
+				unknown.append(other)
+
+		if not unknown:
+			self.frontier.discard(cell)
+			return None
+		self.frontier.add(cell)
+		return (frozenset(unknown), remaining)
+
+	def propagate(self):
+		'''
+		Applies the single-cell and subset rules until nothing queued is left to deduce.
+		'''
+		while self.dirty:
+			cell = self.dirty.pop()
+			found = self.constraint(cell)
+			if found is None:
+				continue
+			unknown, remaining = found
+
+			# single-cell rule
+			if remaining == 0 or remaining == len(unknown):
+				self.settle(unknown, remaining > 0)
+				continue
+
+			# subset rule, against every number close enough to share a neighbour
+			for other in self.cells_within(cell, 2):
+				if other == cell or other not in self.frontier:
+					continue
+				other_found = self.constraint(other)
+				if other_found is None:
+					continue
+				other_unknown, other_remaining = other_found
+				if unknown < other_unknown:
+					self.settle_difference(other_unknown - unknown, other_remaining - remaining)
+				elif other_unknown < unknown:
+					self.settle_difference(unknown - other_unknown, remaining - other_remaining)
+
+	def settle_difference(self, cells: frozenset, num_mines: int):
+		if num_mines == 0:
+			self.settle(cells, False)
+		elif num_mines == len(cells):
+			self.settle(cells, True)
+
+	def settle(self, cells: frozenset, is_mine: bool):
+		'''
+		Records cells as proven mines or proven safe, and queues the numbers around them.
+		'''
+		proven = self.mines if is_mine else self.safe
+		for cell in cells:
+			if cell in proven:
+				continue
+			proven.add(cell)
+			if is_mine:
+				self.unflagged_mines.append(cell)
+			self.dirty.update(self.cells_within(cell, 1))
+
+	def safe_cells(self) -> [(int, int)]:
+		'''
+		Returns every unrevealed cell the revealed numbers prove safe, as (row, col) tuples.
+		'''
+		self.propagate()
+		return [divmod(cell, self.board.cols) for cell in self.safe]
+
+	def mine_cells(self) -> [(int, int)]:
+		'''
+		Returns every cell the revealed numbers prove to be a mine, as (row, col) tuples.
+		'''
+		self.propagate()
+		return [divmod(cell, self.board.cols) for cell in self.mines]
+
+	def hint(self) -> (CSChoice, int, int):
+		'''
+		Returns a move that is certain to be right: a safe cell to click, or else a proven mine to flag.
+		Returns None if the revealed numbers do not settle any such cell, i.e. the player has to guess.
+		'''
+		self.propagate()
+		for cell in self.safe:
+			return (CSChoice.CLICK, *divmod(cell, self.board.cols))
+
+		# mines the player has already flagged are dropped for good
+		while self.unflagged_mines:
+			row, col = divmod(self.unflagged_mines[-1], self.board.cols)
+			if not self.board.grid[row][col].is_flagged():
+				return (CSChoice.FLAG, row, col)
+			self.unflagged_mines.pop()
+		return None
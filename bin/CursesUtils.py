@@ -4,6 +4,8 @@ as well as a few other useful utilities.
 '''
 
 import curses
+import string
+from itertools import groupby
 
 # this is a terrible way of implementing C#-style enumerations,
 # but it works for now I guess.
@@ -24,6 +26,27 @@ BUTTON_BLACK_RED = 9 # black-red highlight
 
 ESC_KEY = 27
 
+# colours of the symbols that make up the minesweeper grid.
+# blank tiles use the default colour too: a space looks the same in any colour on a black background,
+# and keeping it default lets whole runs of unrevealed tiles go out in one write.
+SYMBOL_COLOURS = {
+	'(': DEFAULT,
+	')': DEFAULT,
+	' ': DEFAULT,
+	'0': DEFAULT,
+	'1': TEXT_GREEN,
+	'2': TEXT_BLUE,
+	'3': TEXT_RED,
+	'P': TEXT_YELLOW,
+	'*': MENU_SELECT,
+	'#': BUTTON_BLACK_RED
+}
+OTHER_SYMBOL_COLOUR = TEXT_MAGENTA
+
+# symbol -> curses attribute for every printable character,
+# filled in by init_curses_protocols once the colour pairs exist
+SYMBOL_ATTRS = {}
+
 def init_curses_protocols(stdscr):
 	curses.curs_set(False)
 	curses.mousemask(-1)
@@ -41,9 +64,65 @@ def init_curses_protocols(stdscr):
 
 	curses.init_pair(BUTTON_RED, curses.COLOR_WHITE, curses.COLOR_RED)
 	curses.init_pair(BUTTON_BLACK_RED, curses.COLOR_BLACK, curses.COLOR_RED)
+
+	# precompute the attribute of every symbol that can show up on the grid
+	SYMBOL_ATTRS.clear()
+	for symbol in string.printable:
+		SYMBOL_ATTRS[symbol] = curses.color_pair(SYMBOL_COLOURS.get(symbol, OTHER_SYMBOL_COLOUR))
 	
 
 def write_text_with_colour(stdscr, y: int, x: int, text: str, colour_id: int):
 	stdscr.attron(curses.color_pair(colour_id))
 	stdscr.addstr(y, x, text)
-	stdscr.attroff(curses.color_pair(colour_id))
\ No newline at end of file
+	stdscr.attroff(curses.color_pair(colour_id))
+
+def write_text_with_symbol_colours(stdscr, y: int, x: int, text: str):
+	'''
+	Writes grid text coloured symbol by symbol, with one addstr per run of symbols that share a colour.
+	'''
+	for attr, run in groupby(text, SYMBOL_ATTRS.__getitem__):
+		run = "".join(run)
+		stdscr.addstr(y, x, run, attr)
+		x += len(run)
+
+# the mouse events that mean something to a screen; releases and motion are dropped as they are read
+MOUSE_PRESSES = curses.BUTTON1_PRESSED | curses.BUTTON2_PRESSED | curses.BUTTON3_PRESSED
+
+def read_events(stdscr, timeout_ms: int = -1) -> [(int, int, int, int)]:
+	'''
+	Waits for the next input event, then takes every other event already queued without waiting for more.
+	Returns them in order as (key, y, x, bstate) tuples, with y, x and bstate only filled in for mouse presses.
+	The list is empty if all that came in were mouse releases or motion,
+	or if nothing came in within timeout_ms milliseconds. A negative timeout waits for as long as it takes.
+	The wait sleeps in the terminal driver, so an idle screen costs no CPU.
+	'''
+	events = []
+	stdscr.timeout(timeout_ms)
+	key = stdscr.getch()
+	stdscr.nodelay(True)
+	while key != -1:
+		if key == curses.KEY_MOUSE:
+			# the mouse state has to be taken now, before the next event replaces it
+			try:
+				_, x, y, _, bstate = curses.getmouse()
+			except curses.error:
+				bstate = 0
+			if bstate & MOUSE_PRESSES:
+				events.append((key, y, x, bstate))
+		else:
+			events.append((key, -1, -1, 0))
+		key = stdscr.getch()
+	stdscr.timeout(-1)
+	return events
+
+def wait_for_press(stdscr) -> int:
+	'''
+	Drops every queued event, then waits for a key or a mouse press that comes after, e.g. to leave a results screen.
+	The release of the press that led here, or of this one, is never mistaken for a new press.
+	'''
+	curses.flushinp()
+	while True:
+		events = read_events(stdscr)
+		if events:
+			curses.flushinp()
+			return events[0][0]
@@ -0,0 +1,34 @@
+'''
+The ConsoleSweeper engine: the board, solver, replays, saves and scores, shared by both frontends and the headless tools.
+
+Nothing is loaded until it is used. `import bin` is free, and each module is imported on first access,
+e.g. `bin.ConsoleSweeperBones`; `from bin import ConsoleSweeperBones` works as before.
+Importing any of them has no side effects: settings are only read when ConsoleSweeperSettings is asked for one.
+'''
+
+import importlib
+
+ENGINE_MODULES = [
+	"ConsoleSweeperBones",
+	"ConsoleSweeperArrays",
+	"ConsoleSweeperInfinite",
+	"ConsoleSweeperSolver",
+	"ConsoleSweeperProbability",
+	"ConsoleSweeperNoGuess",
+	"ConsoleSweeperReplay",
+	"ConsoleSweeperSave",
+	"ConsoleSweeperScores",
+	"ConsoleSweeperSession",
+	"ConsoleSweeperSettings",
+	"ConsoleSweeperConsole",
+	"ConsoleSweeperSim",
+	"CursesUtils",
+]
+
+def __getattr__(name: str):
+	if name in ENGINE_MODULES:
+		return importlib.import_module("." + name, __name__)
+	raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__():
+	return sorted(list(globals()) + ENGINE_MODULES)
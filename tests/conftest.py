@@ -0,0 +1,12 @@
+import pytest
+
+from bin import ConsoleSweeperBones
+
+@pytest.fixture(params = ConsoleSweeperBones.BOARD_ENGINES)
+def engine(request) -> str:
+	'''
+	Runs a test once per board engine; the arrays engine needs NumPy.
+	'''
+	if request.param == "arrays":
+		pytest.importorskip("numpy")
+	return request.param
@@ -0,0 +1,54 @@
+'''
+Shared helpers for the tests: random games and board comparisons.
+'''
+
+from random import Random
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSChoice, CSStatus
+
+def play_random_game(board: ConsoleSweeperBones.CSBoard, seed: int, max_moves: int = 200, chords: bool = False) -> CSStatus:
+	'''
+	Plays random clicks and flags on hidden cells until the game ends or max_moves moves are made.
+	With chords set, some moves flag around a revealed number, rightly or wrongly, and chord it.
+	'''
+	rng = Random(seed)
+	status = CSStatus.PLAYING
+	for _ in range(max_moves):
+		if status != CSStatus.PLAYING:
+			break
+		if chords and board.clicks_so_far > 0 and rng.random() < 0.3:
+			numbers = [(row, col) for row in range(board.rows) for col in range(board.cols)
+				if board.grid[row][col].is_clicked() and board.grid[row][col].num_mines_around > 0]
+			if numbers:
+				row, col = rng.choice(numbers)
+				flag_around(board, row, col, rng)
+				status = board.apply_actions([(CSChoice.CHORD, row, col)]).status
+				continue
+		hidden = [(row, col) for row in range(board.rows) for col in range(board.cols) if not board.grid[row][col].is_clicked()]
+		row, col = rng.choice(hidden)
+		action = CSChoice.FLAG if board.clicks_so_far > 0 and rng.random() < 0.2 else CSChoice.CLICK
+		status = board.apply_actions([(action, row, col)]).status
+	return status
+
+def flag_around(board: ConsoleSweeperBones.CSBoard, row: int, col: int, rng: Random):
+	'''
+	Flags random hidden neighbours of (row, col), mines or not, until there are as many flags around it as its number.
+	'''
+	neighbours = [(x_nbr, y_nbr) for x_nbr in range(row - 1, row + 2) for y_nbr in range(col - 1, col + 2)
+		if board.in_bounds(x_nbr, y_nbr) and not board.grid[x_nbr][y_nbr].is_clicked()]
+	rng.shuffle(neighbours)
+	flags = sum(board.grid[x_nbr][y_nbr].is_flagged() for x_nbr, y_nbr in neighbours)
+	for x_nbr, y_nbr in neighbours:
+		if flags >= board.grid[row][col].num_mines_around:
+			break
+		if not board.grid[x_nbr][y_nbr].is_flagged() and board.apply_actions([(CSChoice.FLAG, x_nbr, y_nbr)]).applied:
+			flags += 1
+
+def board_state(board: ConsoleSweeperBones.CSBoard) -> tuple:
+	'''
+	Everything that tells two boards apart: their cell maps, neighbour counts and counters.
+	'''
+	counts = tuple(tuple(board.grid[row][col].num_mines_around for col in range(board.cols)) for row in range(board.rows))
+	counters = (board.mines, board.clicks_so_far, board.flags_left, board.flags_placed, board.num_clicked_cells, board.mines_flagged)
+	return (tuple(bytes(cell_map) for cell_map in board.cell_maps()), counts, counters)
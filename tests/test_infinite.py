@@ -0,0 +1,29 @@
+'''
+The infinite board's openings stay bounded at every density.
+'''
+
+import pytest
+
+from bin.ConsoleSweeperBones import CSDifficulty
+from bin.ConsoleSweeperInfinite import CSInfiniteBoard, FLOOD_RADIUS
+
+@pytest.mark.parametrize("difficulty", list(CSDifficulty))
+def test_opening_stops_at_flood_radius(difficulty):
+	board = CSInfiniteBoard(difficulty.value, 1)
+	row, col = board.rows // 2, board.cols // 2
+	revealed = board.click_tile(row, col)
+	assert len(revealed) <= (2 * FLOOD_RADIUS + 1) ** 2
+	assert all(abs(x - row) <= FLOOD_RADIUS and abs(y - col) <= FLOOD_RADIUS for x, y in revealed)
+	assert not any(board.grid[x][y].is_mine() for x, y in revealed)
+
+def test_click_on_edge_carries_opening_on():
+	# at this density the opening always reaches its edge
+	board = CSInfiniteBoard(CSDifficulty.EASY.value, 1)
+	row, col = board.rows // 2, board.cols // 2
+	revealed = set(board.click_tile(row, col))
+	edge = [(x, y) for x, y in revealed if x == row - FLOOD_RADIUS and board.grid[x][y].num_mines_around == 0]
+	assert edge
+	x, y = edge[0]
+	more = board.click_tile(x - 1, y)
+	assert more and not board.grid[x - 1][y].is_mine()
+	assert not revealed & set(more)
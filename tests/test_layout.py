@@ -0,0 +1,37 @@
+'''
+Mine layouts: the first click's region is kept clear without losing or stacking mines.
+'''
+
+import pytest
+
+from bin import ConsoleSweeperBones
+
+@pytest.mark.parametrize("num_mines", [0, 100, 891, 899])
+def test_first_click_region_is_clear(engine, num_mines):
+	board = ConsoleSweeperBones.create_board(30, 30, num_mines, engine, num_mines)
+	board.prepare_layout()
+	board.click_tile(10, 20)
+	mines = bytes(board.cell_maps()[0])
+	assert sum(mines) == num_mines
+	# the whole 3x3 region stays clear unless the board is too crowded for it, and then only the cell clicked does
+	region = board.forbidden_region([10, 20], 1) if num_mines <= 891 else [10 * 30 + 20]
+	assert not any(mines[cell] for cell in region)
+	for row in range(30):
+		for col in range(30):
+			assert board.grid[row][col].num_mines_around == board.count_neighbours_deadly(row, col)
+	board.check_counters()
+
+def test_same_seed_same_layout(engine):
+	layouts = set()
+	for _ in range(2):
+		board = ConsoleSweeperBones.create_board(20, 20, 80, engine, 42)
+		board.click_tile(3, 3)
+		layouts.add(bytes(board.cell_maps()[0]))
+	assert len(layouts) == 1
+
+def test_wide_safe_radius_is_kept_clear(engine):
+	board = ConsoleSweeperBones.create_board(30, 30, 400, engine, 9)
+	board.emplace_mines([15, 15], 3)
+	mines = bytes(board.cell_maps()[0])
+	assert sum(mines) == 400
+	assert not any(mines[cell] for cell in board.forbidden_region([15, 15], 3))
@@ -0,0 +1,23 @@
+'''
+The no-guess board pool: taking boards, and refilling it without holding the game up.
+'''
+
+from bin import ConsoleSweeperNoGuess
+
+def test_empty_pool_refills_in_background(tmp_path):
+	pool_dir = str(tmp_path)
+	# nothing to take yet, so the game gets no board and the pool starts refilling
+	assert ConsoleSweeperNoGuess.next_board(pool_dir, 6, 6, 4, 3) is None
+	ConsoleSweeperNoGuess.REFILLS[ConsoleSweeperNoGuess.pool_path(pool_dir, 6, 6, 4)].join()
+	assert ConsoleSweeperNoGuess.pool_size(pool_dir, 6, 6, 4) >= 3
+
+	seed, row, col = ConsoleSweeperNoGuess.next_board(pool_dir, 6, 6, 4, 3)
+	assert ConsoleSweeperNoGuess.solves_without_guessing(6, 6, 4, seed, (row, col))
+
+def test_pool_hands_out_each_board_once(tmp_path):
+	pool_dir = str(tmp_path)
+	boards = [(seed, 0, 0) for seed in range(5)]
+	ConsoleSweeperNoGuess.add_boards(pool_dir, 6, 6, 4, boards)
+	taken = [ConsoleSweeperNoGuess.take_board(pool_dir, 6, 6, 4) for _ in range(6)]
+	assert sorted(taken[:5]) == boards
+	assert taken[5] is None
@@ -0,0 +1,50 @@
+'''
+Round trips through the binary replay format.
+'''
+
+import pytest
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSStatus
+from bin.ConsoleSweeperReplay import CSReplay, CSReplayWriter
+from tests.helpers import board_state, play_random_game
+
+@pytest.mark.parametrize("seed", range(20))
+def test_replay_rebuilds_live_board(tmp_path, engine, seed):
+	board = ConsoleSweeperBones.create_board(12, 15, 30, engine, seed)
+	path = tmp_path / "game.csr"
+	board.action_log = CSReplayWriter(str(path), board)
+	play_random_game(board, seed)
+	board.action_log.close()
+
+	replay = CSReplay.load(str(path))
+	assert (replay.seed, replay.rows, replay.cols, replay.mines) == (board.seed, 12, 15, 30)
+	assert board_state(replay.board_at(None, engine)) == board_state(board)
+
+@pytest.mark.parametrize("seed", range(40))
+def test_replay_rebuilds_games_with_chords(tmp_path, engine, seed):
+	board = ConsoleSweeperBones.create_board(12, 12, 25, engine, seed)
+	path = tmp_path / "game.csr"
+	board.action_log = CSReplayWriter(str(path), board)
+	status = play_random_game(board, seed, chords = True)
+	board.action_log.close()
+
+	replay = CSReplay.load(str(path))
+	assert board_state(replay.board_at(None, engine)) == board_state(board)
+	assert replay.result(engine) == {CSStatus.LOST: "lost", CSStatus.WON: "won"}.get(status, "unfinished")
+
+def test_replay_rebuilds_board_part_way(tmp_path, engine):
+	board = ConsoleSweeperBones.create_board(10, 10, 12, engine, 7)
+	path = tmp_path / "game.csr"
+	board.action_log = CSReplayWriter(str(path), board)
+	board.click_tile(5, 5)
+	board.action_log.close()
+	after_first_click = board_state(board)
+
+	replay = CSReplay.load(str(path))
+	assert board_state(replay.board_at(1, engine)) == after_first_click
+	assert replay.board_at(0, engine).num_clicked_cells == 0
+
+def test_replay_rejects_other_files():
+	with pytest.raises(ValueError):
+		CSReplay.from_bytes(b"\x00" * 32)
@@ -0,0 +1,58 @@
+'''
+The scanline flood fill against a plain cell-by-cell reference.
+'''
+
+from random import Random
+
+import pytest
+
+from bin import ConsoleSweeperBones
+
+def reference_reveal(board: ConsoleSweeperBones.CSBoard, row: int, col: int) -> {(int, int)}:
+	'''
+	The cells a click on (row, col) should reveal: every hidden cell reachable through hidden zeros, and the cells bordering them.
+	'''
+	revealed = set()
+	to_visit = [(row, col)]
+	while to_visit:
+		row, col = to_visit.pop()
+		if (row, col) in revealed or board.grid[row][col].is_clicked():
+			continue
+		revealed.add((row, col))
+		tile = board.grid[row][col]
+		if tile.is_mine() or tile.num_mines_around != 0:
+			continue
+		to_visit += [(x_nbr, y_nbr) for x_nbr in range(row - 1, row + 2) for y_nbr in range(col - 1, col + 2) if board.in_bounds(x_nbr, y_nbr)]
+	return revealed
+
+@pytest.mark.parametrize("seed", range(30))
+def test_scanline_reveal_matches_reference(engine, seed):
+	rng = Random(seed)
+	rows, cols = rng.randint(1, 40), rng.randint(1, 40)
+	board = ConsoleSweeperBones.create_board(rows, cols, int(rows * cols * rng.choice([0.05, 0.12, 0.25])), engine, seed)
+	board.emplace_mines([rng.randrange(rows), rng.randrange(cols)])
+	# flags and scattered revealed cells are where a fill is most likely to go wrong
+	for _ in range(rows * cols // 10):
+		row, col = rng.randrange(rows), rng.randrange(cols)
+		if rng.random() < 0.5:
+			board.set_flag(row, col, True)
+		else:
+			board.reveal_region(row, col)
+
+	for _ in range(10):
+		row, col = rng.randrange(rows), rng.randrange(cols)
+		expected = reference_reveal(board, row, col)
+		revealed = board.reveal_region(row, col)
+		assert len(revealed) == len(set(revealed))
+		assert set(revealed) == expected
+		# revealed cells hand their flags back; a mine going off ends the game, so it keeps its own
+		assert not any(board.grid[x][y].is_flagged() and not board.grid[x][y].is_mine() for x, y in revealed)
+		board.check_counters()
+
+def test_array_reveal_keeps_its_arrays():
+	pytest.importorskip("numpy")
+	board = ConsoleSweeperBones.create_board(50, 50, 100, "arrays", 4)
+	board.emplace_mines([25, 25])
+	maps = (board.clicked_map, board.flag_map, board.count_map)
+	assert len(board.reveal_region(25, 25)) > 1
+	assert all(a is b for a, b in zip(maps, (board.clicked_map, board.flag_map, board.count_map)))
@@ -0,0 +1,51 @@
+'''
+Round trips through the save format, on both board engines.
+'''
+
+import pytest
+
+from bin import ConsoleSweeperBones, ConsoleSweeperSave
+from tests.helpers import board_state, play_random_game
+
+@pytest.mark.parametrize("size", [(1, 1), (3, 5), (16, 16), (9, 31)])
+def test_save_then_load_gives_same_board(tmp_path, engine, size):
+	rows, cols = size
+	board = ConsoleSweeperBones.create_board(rows, cols, rows * cols // 6, engine, rows * cols)
+	play_random_game(board, rows + cols, 20)
+	board.set_flag(rows - 1, cols - 1, not board.grid[rows - 1][cols - 1].is_clicked())
+	path = str(tmp_path / "game.sav")
+	ConsoleSweeperSave.save_game(path, board, 12.5)
+
+	loaded, elapsed = ConsoleSweeperSave.load_game(path, engine)
+	assert elapsed == 12.5
+	assert loaded.seed == board.seed
+	assert board_state(loaded) == board_state(board)
+	loaded.check_counters()
+
+def test_save_loads_into_other_engine(tmp_path):
+	pytest.importorskip("numpy")
+	board = ConsoleSweeperBones.create_board(20, 20, 60, "tiles", 3)
+	play_random_game(board, 3, 30)
+	path = str(tmp_path / "game.sav")
+	ConsoleSweeperSave.save_game(path, board, 0.0)
+	assert board_state(ConsoleSweeperSave.load_game(path, "arrays")[0]) == board_state(board)
+
+def test_unstarted_game_is_not_saved(tmp_path, engine):
+	board = ConsoleSweeperBones.create_board(5, 5, 3, engine, 1)
+	with pytest.raises(ValueError):
+		ConsoleSweeperSave.save_game(str(tmp_path / "game.sav"), board, 0.0)
+
+@pytest.mark.parametrize("damage", ["truncated", "bit_flipped"])
+def test_corrupted_save_raises_value_error(tmp_path, damage):
+	board = ConsoleSweeperBones.create_board(16, 16, 40, "tiles", 5)
+	play_random_game(board, 5, 20)
+	path = tmp_path / "game.sav"
+	ConsoleSweeperSave.save_game(str(path), board, 1.0)
+	data = bytearray(path.read_bytes())
+	if damage == "truncated":
+		data = data[:len(data) - 4]
+	else:
+		data[ConsoleSweeperSave.SAVE_HEADER.size + 2] ^= 0x10
+	path.write_bytes(bytes(data))
+	with pytest.raises(ValueError, match = "Corrupted"):
+		ConsoleSweeperSave.load_game(str(path))
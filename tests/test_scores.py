@@ -0,0 +1,63 @@
+'''
+The scoreboard's difficulty names and its background writer.
+'''
+
+import sqlite3
+
+import pytest
+
+from bin import ConsoleSweeperBones, ConsoleSweeperScores
+from bin.ConsoleSweeperBones import CSDifficulty
+
+def test_standard_boards_are_named_by_difficulty():
+	for rows in range(1, 101):
+		for cols in range(1, 101):
+			counts = [ConsoleSweeperBones.mine_count(rows, cols, difficulty.value) for difficulty in CSDifficulty]
+			for difficulty, mines in zip(CSDifficulty, counts):
+				# on tiny boards two difficulties can give the same count, and the easier one names it
+				expected = list(CSDifficulty)[counts.index(mines)].name
+				assert ConsoleSweeperScores.difficulty_name(rows, cols, mines) == expected
+
+def test_other_mine_counts_are_custom():
+	assert ConsoleSweeperScores.difficulty_name(15, 15, 1) == "CUSTOM"
+	assert ConsoleSweeperScores.difficulty_name(15, 15, ConsoleSweeperBones.mine_count(15, 15, CSDifficulty.NORMAL.value)) == "NORMAL"
+
+def test_writer_records_games(tmp_path):
+	db_path = str(tmp_path / "scores.db")
+	writer = ConsoleSweeperScores.CSScoreWriter(db_path, "tester")
+	for seconds in (30.0, 10.0, 20.0):
+		writer.record(9, 9, 9, "EASY", "random", True, seconds, 5)
+	writer.record(9, 9, 9, "EASY", "random", False, 1.0, 1)
+	assert writer.flush()
+	assert [best[0] for best in ConsoleSweeperScores.best_times(db_path, 9, 9, "EASY")] == [10.0, 20.0, 30.0]
+	assert ConsoleSweeperScores.games_played(db_path, 9, 9, "EASY") == (4, 3)
+	writer.close()
+
+def test_writer_errors_reach_the_caller(tmp_path):
+	db_path = str(tmp_path / "scores.db")
+	writer = ConsoleSweeperScores.CSScoreWriter(db_path)
+	writer.record(9, 9, 9, "EASY", "random", True, 1.0, 1)
+	assert writer.flush()
+	# the next game the writer thread tries to insert fails, and stops it
+	connection = sqlite3.connect(db_path)
+	connection.execute("CREATE TRIGGER refuse BEFORE INSERT ON games BEGIN SELECT RAISE(ABORT, 'scores are closed'); END")
+	connection.commit()
+	connection.close()
+	writer.record(9, 9, 9, "EASY", "random", True, 2.0, 1)
+	with pytest.raises(sqlite3.IntegrityError):
+		writer.flush()
+	# with the thread gone, nothing is left to wait for
+	writer.record(9, 9, 9, "EASY", "random", True, 3.0, 1)
+	with pytest.raises(sqlite3.IntegrityError):
+		writer.flush()
+	with pytest.raises(sqlite3.IntegrityError):
+		writer.close()
+
+def test_writer_that_cannot_open_database_does_not_hang(tmp_path):
+	# a folder cannot be opened as a database
+	writer = ConsoleSweeperScores.CSScoreWriter(str(tmp_path))
+	writer.record(9, 9, 9, "EASY", "random", True, 1.0, 1)
+	with pytest.raises(sqlite3.OperationalError):
+		writer.flush()
+	with pytest.raises(sqlite3.OperationalError):
+		writer.close()
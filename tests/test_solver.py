@@ -0,0 +1,38 @@
+'''
+The solver's deductions against the true mine layout.
+'''
+
+from random import Random
+
+import pytest
+
+from bin import ConsoleSweeperBones
+from bin.ConsoleSweeperBones import CSChoice, CSStatus
+from bin.ConsoleSweeperSolver import CSSolver
+
+@pytest.mark.parametrize("seed", range(20))
+def test_solver_deductions_are_true(seed):
+	rng = Random(seed)
+	board = ConsoleSweeperBones.create_board(16, 16, 40, "tiles", seed)
+	solver = CSSolver(board)
+	solver.update(board.click_tile(8, 8))
+	status = CSStatus.PLAYING
+	while status == CSStatus.PLAYING:
+		assert not any(board.grid[row][col].is_mine() for row, col in solver.safe_cells())
+		assert all(board.grid[row][col].is_mine() for row, col in solver.mine_cells())
+		hint = solver.hint()
+		if hint is None or hint[0] == CSChoice.FLAG:
+			# nothing left to click for sure, so guess among the cells not known to be mines
+			known_mines = set(solver.mine_cells())
+			hidden = [(row, col) for row in range(board.rows) for col in range(board.cols)
+				if not board.grid[row][col].is_clicked() and (row, col) not in known_mines]
+			hint = (CSChoice.CLICK, *rng.choice(hidden))
+		result = board.apply_actions([hint])
+		solver.update(result.revealed)
+		status = result.status
+
+def test_solver_picks_up_board_in_play():
+	board = ConsoleSweeperBones.create_board(16, 16, 40, "tiles", 5)
+	board.click_tile(0, 0)
+	fresh = CSSolver(board)
+	assert set(fresh.safe_cells()) <= {(row, col) for row in range(16) for col in range(16) if not board.grid[row][col].is_mine()}